@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
 from pathlib import Path
+import math
 import os
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -20,12 +21,18 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 # See https://docs.djangoproject.com/en/4.2/howto/deployment/checklist/
 
 # SECURITY WARNING: keep the secret key used in production secret!
-SECRET_KEY = 'django-insecure-8+c-ywthcw+0*0$rbf&l3u0m4=k1e3x@uu*^k=mnl0_p63t#^t'
+SECRET_KEY = os.environ.get(
+    'DJANGO_SECRET_KEY',
+    'django-insecure-8+c-ywthcw+0*0$rbf&l3u0m4=k1e3x@uu*^k=mnl0_p63t#^t')
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = os.environ.get('DJANGO_DEBUG', 'true').lower() == 'true'
 
-ALLOWED_HOSTS = []
+ALLOWED_HOSTS = [
+    host.strip()
+    for host in os.environ.get('DJANGO_ALLOWED_HOSTS', '').split(',')
+    if host.strip()
+]
 
 
 # Application definition
@@ -46,6 +53,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.ProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -85,7 +93,58 @@ DATABASES = {
         'HOST': os.environ.get('DB_HOST'),
         'NAME': os.environ.get('DB_NAME'),
         'USER': os.environ.get('DB_USER'),
-        'PASSWORD': os.environ.get('DB_PASS')
+        'PASSWORD': os.environ.get('DB_PASS'),
+        # Keep connections open between requests, checking them on reuse.
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': os.environ.get(
+            'DB_CONN_HEALTH_CHECKS', 'true').lower() == 'true',
+        'POOL': {
+            'MAX_SIZE': int(os.environ.get('DB_POOL_MAX_SIZE', 10)),
+            'TIMEOUT': float(os.environ.get('DB_POOL_TIMEOUT', 5)),
+        },
+    }
+}
+
+# With DB_POOL, connections are borrowed from an in-process pool per
+# request instead of being kept per thread, which bounds the connection
+# count under ASGI where the ORM runs on varying threads.
+if os.environ.get('DB_POOL', 'false').lower() == 'true':
+    DATABASES['default']['ENGINE'] = 'core.db.backends.postgresql_pool'
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+
+# Read replicas (comma separated hosts) serve GETs on the recipe, tag and
+# user list endpoints; see core.routers.
+DATABASE_REPLICAS = []
+for number, host in enumerate(
+        filter(None, os.environ.get('DB_REPLICA_HOSTS', '').split(',')), 1):
+    alias = f'replica_{number}'
+    DATABASES[alias] = {
+        **DATABASES['default'],
+        'HOST': host.strip(),
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ['core.routers.ReplicaRouter']
+REPLICA_MAX_LAG_SECONDS = float(os.environ.get('DB_REPLICA_MAX_LAG', 10))
+REPLICA_LAG_CHECK_SECONDS = float(
+    os.environ.get('DB_REPLICA_LAG_CHECK_SECONDS', 5))
+# Never below max lag + check interval; core.routers.pin_seconds enforces it.
+REPLICA_PIN_SECONDS = int(os.environ.get(
+    'DB_REPLICA_PIN_SECONDS',
+    math.ceil(REPLICA_MAX_LAG_SECONDS + REPLICA_LAG_CHECK_SECONDS)))
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# Response versions live in the default cache, so it must be shared by all
+# workers (e.g. django.core.cache.backends.redis.RedisCache) in production.
+
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get(
+            'CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('CACHE_LOCATION', ''),
     }
 }
 
@@ -133,6 +192,102 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 AUTH_USER_MODEL = 'core.User'
 
+PROFILING = {
+    'SAMPLE_RATE': float(os.environ.get('PROFILING_SAMPLE_RATE', 1.0)),
+    'N_PLUS_ONE_THRESHOLD': int(os.environ.get('PROFILING_N_PLUS_ONE', 5)),
+}
+
+# Hasher profiles trade login CPU (and memory) against cracking cost. The
+# first hasher of the selected profile hashes new passwords; existing
+# hashes from any hasher below keep verifying and are upgraded on login.
+PASSWORD_HASHER_PROFILES = {
+    'default': {
+        'HASHERS': ['core.hashers.PBKDF2PasswordHasher'],
+        'COST': {
+            'PBKDF2_ITERATIONS': int(
+                os.environ.get('PBKDF2_ITERATIONS', 600000)),
+        },
+    },
+    'memory-hard': {
+        'HASHERS': ['core.hashers.ScryptPasswordHasher'],
+        'COST': {
+            'SCRYPT_WORK_FACTOR': int(
+                os.environ.get('SCRYPT_WORK_FACTOR', 2 ** 14)),
+        },
+    },
+    # Never use outside test suites; app.test_settings selects it.
+    'test': {
+        'HASHERS': ['core.hashers.PBKDF2PasswordHasher'],
+        'COST': {'PBKDF2_ITERATIONS': 1000},
+    },
+}
+PASSWORD_HASHER_PROFILE = os.environ.get('PASSWORD_HASHER_PROFILE', 'default')
+PASSWORD_HASHER_COST = PASSWORD_HASHER_PROFILES[PASSWORD_HASHER_PROFILE]['COST']
+PASSWORD_HASHERS = list(dict.fromkeys(
+    PASSWORD_HASHER_PROFILES[PASSWORD_HASHER_PROFILE]['HASHERS'] + [
+        'core.hashers.PBKDF2PasswordHasher',
+        'core.hashers.ScryptPasswordHasher',
+        'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+        'django.contrib.auth.hashers.Argon2PasswordHasher',
+        'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    ]))
+
+# Password hashing runs on a bounded pool (thread, process or inline);
+# calls beyond WORKERS + MAX_QUEUE get a 429.
+PASSWORD_HASHING = {
+    'EXECUTOR': os.environ.get('PASSWORD_HASHING_EXECUTOR', 'thread'),
+    'WORKERS': int(os.environ.get('PASSWORD_HASHING_WORKERS', 0)) or None,
+    'MAX_QUEUE': int(os.environ.get('PASSWORD_HASHING_MAX_QUEUE', 32)),
+    'TIMEOUT': float(os.environ.get('PASSWORD_HASHING_TIMEOUT', 30)),
+}
+
+# Throttle buckets live in this process unless a shared cache alias is set.
+THROTTLE_BUCKETS = {
+    'BACKEND': os.environ.get('THROTTLE_CACHE_BACKEND'),
+    'MAX_KEYS': int(os.environ.get('THROTTLE_MAX_KEYS', 100000)),
+}
+
+TOKEN_AUTH_CACHE = {
+    'MAX_SIZE': int(os.environ.get('TOKEN_AUTH_CACHE_SIZE', 10000)),
+    'TTL': int(os.environ.get('TOKEN_AUTH_CACHE_TTL', 60)),
+    'BACKEND': os.environ.get('TOKEN_AUTH_CACHE_BACKEND'),
+}
+
+# Serve recipe/tag reads from values() rows instead of DRF serializers.
+API_FAST_READS = os.environ.get('API_FAST_READS', 'true').lower() == 'true'
+
+# Route recipe/tag GETs to the async views; only worth it under ASGI.
+API_ASYNC_READS = os.environ.get('API_ASYNC_READS', 'false').lower() == 'true'
+
+RECIPE_BULK_MAX_ITEMS = int(os.environ.get('RECIPE_BULK_MAX_ITEMS', 5000))
+
+# Paginated counts switch from COUNT(*) to the planner's estimate here.
+PAGINATION_EXACT_COUNT_LIMIT = int(
+    os.environ.get('API_EXACT_COUNT_LIMIT', 10000))
+
 REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    # Both use orjson when it is installed and fall back to the stdlib.
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'core.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    'DEFAULT_PAGINATION_CLASS': 'core.pagination.KeysetPagination',
+    # Token-bucket rates (burst/period) for core.throttling; app.test_settings
+    # turns them off.
+    'DEFAULT_THROTTLE_RATES': {
+        'login_ip': os.environ.get('THROTTLE_LOGIN_IP', '30/min'),
+        'login_email': os.environ.get('THROTTLE_LOGIN_EMAIL', '10/min'),
+        'user_create_ip': os.environ.get('THROTTLE_USER_CREATE_IP', '20/hour'),
+        'recipe_write': os.environ.get('THROTTLE_RECIPE_WRITE', '600/min'),
+    },
+    'PAGE_SIZE': int(os.environ.get('API_PAGE_SIZE', 100)),
+    # Proxies in front of the app whose X-Forwarded-For entries are trusted
+    # for client addresses; with 0 the throttles key on REMOTE_ADDR alone.
+    'NUM_PROXIES': int(os.environ.get('API_NUM_PROXIES', 0)),
 }
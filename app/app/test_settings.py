@@ -0,0 +1,22 @@
+"""
+Settings for the test suite: the cheap 'test' password hasher profile, no
+throttle rates and a replica alias mirroring the test database. Run it with
+``manage.py test --settings=app.test_settings``.
+"""
+from app.settings import *  # noqa: F401,F403
+from app.settings import (
+    DATABASES, PASSWORD_HASHER_PROFILES, PASSWORD_HASHERS, REST_FRAMEWORK)
+
+
+PASSWORD_HASHER_PROFILE = 'test'
+PASSWORD_HASHER_COST = PASSWORD_HASHER_PROFILES['test']['COST']
+PASSWORD_HASHERS = list(dict.fromkeys(
+    PASSWORD_HASHER_PROFILES['test']['HASHERS'] + PASSWORD_HASHERS))
+
+REST_FRAMEWORK = {**REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': {}}
+
+# Not in DATABASE_REPLICAS: only core.tests.test_routers routes reads to it.
+DATABASES = {
+    **DATABASES,
+    'replica_test': {**DATABASES['default'], 'TEST': {'MIRROR': 'default'}},
+}
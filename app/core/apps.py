@@ -4,3 +4,16 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+
+        from core import signals  # noqa: F401
+        from core.authentication import token_cache
+        from core.hashing import executor
+        from core.metrics import registry
+        from core.middleware import install_query_profiler
+
+        registry.register('token_auth_cache', token_cache.stats)
+        registry.register('password_hashing', executor.stats)
+        connection_created.connect(install_query_profiler)
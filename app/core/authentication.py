@@ -0,0 +1,115 @@
+"""Token authentication with a cache in front of the token/user lookup."""
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.authentication import TokenAuthentication
+
+
+class TokenCache:
+    """
+    Cache of token key -> (user, token) entries with a TTL.
+
+    Without a shared cache alias entries live in an in-process LRU, so other
+    processes may keep serving a revoked token until their entry expires.
+    With ``backend`` set the shared cache is the only tier and is read on
+    every lookup, so a revocation takes effect in every process at once.
+    """
+
+    def __init__(self, max_size=10000, ttl=60, backend=None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls):
+        options = getattr(settings, 'TOKEN_AUTH_CACHE', {})
+        return cls(
+            max_size=options.get('MAX_SIZE', 10000),
+            ttl=options.get('TTL', 60),
+            backend=options.get('BACKEND'),
+        )
+
+    def _shared_key(self, key):
+        return f'auth-token:{key}'
+
+    def get(self, key):
+        if self.backend:
+            value = caches[self.backend].get(self._shared_key(key))
+            with self._lock:
+                if value is None:
+                    self.misses += 1
+                else:
+                    self.hits += 1
+            return value
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+        return None
+
+    def set(self, key, value):
+        if self.backend:
+            caches[self.backend].set(self._shared_key(key), value, self.ttl)
+            return
+        with self._lock:
+            self._store(key, value, time.monotonic())
+
+    def _store(self, key, value, now):
+        self._entries[key] = (now + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def delete(self, *keys):
+        if self.backend:
+            if keys:
+                caches[self.backend].delete_many(
+                    [self._shared_key(key) for key in keys])
+            return
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._entries),
+            }
+
+
+token_cache = TokenCache.from_settings()
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """TokenAuthentication that skips the database for recently seen tokens."""
+
+    def authenticate_credentials(self, key):
+        entry = token_cache.get(key)
+        if entry is None:
+            entry = super().authenticate_credentials(key)
+            token_cache.set(key, entry)
+        user, token = entry
+        # Views may mutate request.user, so never hand out the cached object.
+        return copy.copy(user), token
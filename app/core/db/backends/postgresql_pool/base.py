@@ -0,0 +1,68 @@
+"""
+PostgreSQL backend that borrows connections from a per-process pool.
+
+Django "closes" the connection at the end of each request (run it with
+CONN_MAX_AGE=0); here that returns it to the pool instead. Pool sizing
+comes from the database's ``POOL`` settings, and its stats are published
+in core.metrics as ``db_pool:<alias>``. Pools are keyed by the connection
+parameters and drained when those change or the test database is dropped.
+"""
+import functools
+
+from django.db.backends.postgresql import base
+
+from core.db.backends.postgresql_pool.creation import DatabaseCreation
+from core.db.backends.postgresql_pool.pools import get_pool, pool_key
+from core.db.pool import ConnectionPool, PoolTimeout
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    creation_class = DatabaseCreation
+
+    def get_pool(self, conn_params):
+        return get_pool(
+            self.alias, pool_key(conn_params),
+            functools.partial(self._make_pool, conn_params))
+
+    def _make_pool(self, conn_params):
+        options = self.settings_dict.get('POOL', {})
+        return ConnectionPool(
+            functools.partial(super().get_new_connection, conn_params),
+            max_size=options.get('MAX_SIZE', 10),
+            timeout=options.get('TIMEOUT', 5.0),
+            check=(self._check_pooled
+                   if self.settings_dict['CONN_HEALTH_CHECKS'] else None),
+        )
+
+    def _check_pooled(self, connection):
+        if connection.closed:
+            return False
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+        except self.Database.Error:
+            return False
+        return True
+
+    def get_new_connection(self, conn_params):
+        pool = self.get_pool(conn_params)
+        try:
+            connection = pool.acquire()
+        except PoolTimeout as exc:
+            raise self.Database.OperationalError(str(exc)) from exc
+        # Return it to the pool it came from, even if that has since been
+        # replaced by one for new settings.
+        self._pool = pool
+        return connection
+
+    def _close(self):
+        if self.connection is None:
+            return
+        pool = self._pool
+        try:
+            # Never hand out a connection with a transaction still open.
+            self.connection.rollback()
+        except self.Database.Error:
+            pool.release(self.connection, discard=True)
+        else:
+            pool.release(self.connection, discard=bool(self.connection.closed))
@@ -0,0 +1,53 @@
+"""
+The per-process pools, one per alias and set of connection parameters.
+
+A pool only ever holds connections made with its own parameters: when an
+alias's parameters change (the test runner switching ``NAME`` to the test
+database, override_settings, ...) the old pool is drained and a new one
+started, so nothing keeps handing out or idling on the old database.
+"""
+import threading
+
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from core.metrics import registry
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def pool_key(conn_params):
+    """A hashable key for ``conn_params``, whose values may not be."""
+    return tuple(sorted(
+        (name, repr(value)) for name, value in conn_params.items()))
+
+
+def get_pool(alias, key, make_pool):
+    """The pool for ``alias`` made with parameters ``key``."""
+    with _pools_lock:
+        current = _pools.get(alias)
+        if current is not None and current[0] == key:
+            return current[1]
+        pool = make_pool()
+        _pools[alias] = (key, pool)
+    if current is not None:
+        current[1].close_all()
+    registry.register(f'db_pool:{alias}', pool.stats)
+    return pool
+
+
+def close_pools(alias=None):
+    """Drain the pool of ``alias``, or every pool."""
+    with _pools_lock:
+        aliases = list(_pools) if alias is None else [alias]
+        closing = [_pools.pop(name)[1] for name in aliases if name in _pools]
+    for pool in closing:
+        pool.close_all()
+
+
+@receiver(setting_changed)
+def close_pools_on_databases_change(setting, **kwargs):
+    if setting == 'DATABASES':
+        close_pools()
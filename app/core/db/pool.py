@@ -0,0 +1,135 @@
+"""A small thread-safe pool of reusable connections."""
+import threading
+import time
+from collections import deque
+
+
+class PoolTimeout(Exception):
+    """No connection became free within the pool's timeout."""
+
+
+class ConnectionPool:
+    """
+    Hand out at most ``max_size`` connections made by ``factory``.
+
+    Idle connections are reused newest first and validated with ``check``
+    before being handed out; ``close`` disposes of broken or surplus ones.
+    Callers blocked on a full pool wait up to ``timeout`` seconds. All
+    waiting happens on threads, so it serves sync workers and the threads
+    ASGI runs ORM calls on alike.
+    """
+
+    def __init__(self, factory, max_size=10, timeout=5.0, check=None,
+                 close=None):
+        self.factory = factory
+        self.max_size = max_size
+        self.timeout = timeout
+        self.check = check
+        self.close = close or (lambda connection: connection.close())
+        self._idle = deque()
+        self._size = 0
+        self._in_use = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        self._stats = {
+            'acquired': 0,
+            'created': 0,
+            'discarded': 0,
+            'waits': 0,
+            'timeouts': 0,
+            'acquire_ms_total': 0.0,
+            'acquire_ms_max': 0.0,
+            'max_in_use': 0,
+        }
+
+    def acquire(self):
+        started = time.perf_counter()
+        deadline = started + self.timeout
+        while True:
+            connection = None
+            with self._condition:
+                while not self._idle and self._size >= self.max_size:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        self._stats['timeouts'] += 1
+                        raise PoolTimeout(
+                            f'No connection available within {self.timeout}s '
+                            f'(pool size {self.max_size}).')
+                    self._stats['waits'] += 1
+                    self._condition.wait(remaining)
+                if self._idle:
+                    connection = self._idle.pop()
+                else:
+                    self._size += 1
+
+            if connection is None:
+                try:
+                    connection = self.factory()
+                except BaseException:
+                    self._forget()
+                    raise
+                with self._condition:
+                    self._stats['created'] += 1
+            elif self.check is not None and not self.check(connection):
+                self._discard(connection)
+                continue
+            break
+
+        elapsed = (time.perf_counter() - started) * 1000
+        with self._condition:
+            self._in_use += 1
+            self._stats['acquired'] += 1
+            self._stats['acquire_ms_total'] += elapsed
+            self._stats['acquire_ms_max'] = max(
+                self._stats['acquire_ms_max'], elapsed)
+            self._stats['max_in_use'] = max(
+                self._stats['max_in_use'], self._in_use)
+        return connection
+
+    def release(self, connection, discard=False):
+        with self._condition:
+            self._in_use -= 1
+            discard = discard or self._closed
+        if discard:
+            self._discard(connection)
+            return
+        with self._condition:
+            self._idle.append(connection)
+            self._condition.notify()
+
+    def _discard(self, connection):
+        try:
+            self.close(connection)
+        except Exception:
+            pass
+        self._forget()
+        with self._condition:
+            self._stats['discarded'] += 1
+
+    def _forget(self):
+        with self._condition:
+            self._size -= 1
+            self._condition.notify()
+
+    def close_all(self):
+        """Close the idle connections, and the busy ones as they return."""
+        with self._condition:
+            self._closed = True
+            idle, self._idle = list(self._idle), deque()
+            self._size -= len(idle)
+        for connection in idle:
+            self.close(connection)
+
+    def stats(self):
+        with self._condition:
+            stats = dict(self._stats)
+            stats.update({
+                'size': self._size,
+                'idle': len(self._idle),
+                'in_use': self._in_use,
+                'max_size': self.max_size,
+            })
+        acquired = stats['acquired']
+        stats['acquire_ms_avg'] = (
+            stats['acquire_ms_total'] / acquired if acquired else 0.0)
+        return stats
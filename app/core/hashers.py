@@ -0,0 +1,28 @@
+"""Password hashers whose cost comes from the selected hasher profile."""
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+def _cost(name, default):
+    return getattr(settings, 'PASSWORD_HASHER_COST', {}).get(name, default)
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    """PBKDF2-SHA256 with PASSWORD_HASHER_COST['PBKDF2_ITERATIONS']."""
+
+    @property
+    def iterations(self):
+        return _cost('PBKDF2_ITERATIONS', hashers.PBKDF2PasswordHasher.iterations)
+
+
+class ScryptPasswordHasher(hashers.ScryptPasswordHasher):
+    """Memory-hard scrypt with PASSWORD_HASHER_COST['SCRYPT_WORK_FACTOR']."""
+
+    @property
+    def work_factor(self):
+        return _cost('SCRYPT_WORK_FACTOR', hashers.ScryptPasswordHasher.work_factor)
+
+    @property
+    def maxmem(self):
+        # scrypt needs 128 * n * r bytes; leave headroom over OpenSSL's cap.
+        return 2 * 128 * self.work_factor * self.block_size
@@ -0,0 +1,170 @@
+"""Run password hashing on a bounded pool instead of the request worker."""
+import os
+import threading
+import time
+from concurrent.futures import (
+    ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError as FutureTimeout)
+
+import django
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, make_password
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import Throttled
+
+
+class HashingBusy(Throttled):
+    default_detail = _('Too many password checks in progress.')
+    default_code = 'hashing_busy'
+
+
+def _timed(func, *args):
+    """Run ``func`` in the worker, timing it without the queue wait."""
+    started = time.perf_counter()
+    result = func(*args)
+    return result, (time.perf_counter() - started) * 1000
+
+
+class _Slot:
+    """One queue slot, released once by the caller or the finished task."""
+
+    def __init__(self, semaphore):
+        self._semaphore = semaphore
+        self._lock = threading.Lock()
+        self._held = True
+
+    def release(self, *args):
+        with self._lock:
+            if not self._held:
+                return
+            self._held = False
+        self._semaphore.release()
+
+
+def _verify(password, encoded):
+    """check_password, reporting instead of applying a needed rehash."""
+    updates = []
+    return check_password(password, encoded, updates.append), bool(updates)
+
+
+class HashingExecutor:
+    """
+    Hash on ``workers`` threads or processes with at most ``max_queue``
+    calls waiting behind them. Further calls are rejected with a 429
+    (HashingBusy) instead of piling up. hashlib's PBKDF2 and scrypt release
+    the GIL, so threads parallelise them; ``inline`` hashes on the caller.
+    """
+
+    def __init__(self, kind='thread', workers=None, max_queue=32,
+                 timeout=30, retry_after=1):
+        self.kind = kind
+        self.workers = workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self._slots = threading.BoundedSemaphore(self.workers + max_queue)
+        self._pool = None
+        self._lock = threading.Lock()
+        self._stats = {
+            'hashes': 0,
+            'rejected': 0,
+            'timeouts': 0,
+            'hash_ms_total': 0.0,
+            'hash_ms_max': 0.0,
+        }
+
+    @classmethod
+    def from_settings(cls):
+        options = getattr(settings, 'PASSWORD_HASHING', {})
+        return cls(
+            kind=options.get('EXECUTOR', 'thread'),
+            workers=options.get('WORKERS'),
+            max_queue=options.get('MAX_QUEUE', 32),
+            timeout=options.get('TIMEOUT', 30),
+        )
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None:
+                if self.kind == 'process':
+                    self._pool = ProcessPoolExecutor(
+                        self.workers, initializer=django.setup)
+                else:
+                    self._pool = ThreadPoolExecutor(
+                        self.workers, thread_name_prefix='hashing')
+            return self._pool
+
+    def run(self, func, *args):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._stats['rejected'] += 1
+            raise HashingBusy(wait=self.retry_after)
+        slot = _Slot(self._slots)
+        if self.kind == 'inline':
+            try:
+                result, elapsed = _timed(func, *args)
+            finally:
+                slot.release()
+        else:
+            result, elapsed = self._run_on_pool(slot, func, args)
+        with self._lock:
+            self._stats['hashes'] += 1
+            self._stats['hash_ms_total'] += elapsed
+            self._stats['hash_ms_max'] = max(
+                self._stats['hash_ms_max'], elapsed)
+        return result
+
+    def _run_on_pool(self, slot, func, args):
+        try:
+            future = self._get_pool().submit(_timed, func, *args)
+        except BaseException:
+            slot.release()
+            raise
+        # A timed-out hash keeps running, and keeps its slot until it ends,
+        # so workers + max_queue still bounds the outstanding work.
+        future.add_done_callback(slot.release)
+        try:
+            result = future.result(self.timeout)
+        except FutureTimeout:
+            future.cancel()
+            with self._lock:
+                self._stats['timeouts'] += 1
+            raise HashingBusy(wait=self.retry_after)
+        except Exception:
+            slot.release()
+            raise
+        # Done callbacks run after waiters wake; free the slot for the
+        # caller's next hash right away.
+        slot.release()
+        return result
+
+    def make_password(self, password):
+        if password is None:
+            return make_password(None)
+        return self.run(make_password, password)
+
+    def check_password(self, password, encoded, setter=None):
+        """Like django's check_password, with the rehash run by the caller."""
+        if password is None:
+            return False
+        is_correct, must_update = self.run(_verify, password, encoded)
+        if setter and is_correct and must_update:
+            setter(password)
+        return is_correct
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        hashes = stats['hashes']
+        stats['hash_ms_avg'] = stats['hash_ms_total'] / hashes if hashes else 0.0
+        stats.update({'kind': self.kind, 'workers': self.workers,
+                      'max_queue': self.max_queue})
+        return stats
+
+    def shutdown(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+
+
+executor = HashingExecutor.from_settings()
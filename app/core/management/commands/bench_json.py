@@ -0,0 +1,60 @@
+"""Django command to compare JSON renderer and parser throughput"""
+import io
+import time
+
+from django.core.management.base import BaseCommand
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from core.parsers import FastJSONParser
+from core.renderers import FastJSONRenderer, orjson
+
+
+def recipe_page(size):
+    return {
+        'next': 'http://testserver/api/recipe/recipes/?cursor=cD0xMjM0',
+        'previous': None,
+        'results': [{
+            'id': i,
+            'title': f'Recipe number {i}',
+            'time_minutes': i % 120,
+            'price': f'{i % 1000}.99',
+            'link': f'https://example.com/recipes/{i}',
+            'tags': [{'id': tag, 'name': f'tag {tag}'} for tag in range(3)],
+            'description': 'Lorem ipsum dolor sit amet. ' * 8,
+        } for i in range(size)],
+    }
+
+
+class Command(BaseCommand):
+    """Encode/decode throughput on a realistic recipe list page"""
+    help = 'Compare stdlib and orjson backed JSON rendering and parsing.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size', type=int, default=1000)
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            self.stdout.write('orjson is not installed, comparing fallbacks.')
+        data = recipe_page(options['size'])
+        body = JSONRenderer().render(data)
+        self.stdout.write(f'payload: {len(body) / 1024:.0f} KiB')
+        for name, renderer, parser in [
+            ('stdlib', JSONRenderer(), JSONParser()),
+            ('fast', FastJSONRenderer(), FastJSONParser()),
+        ]:
+            encode = self._best(lambda: renderer.render(data), options)
+            decode = self._best(
+                lambda: parser.parse(io.BytesIO(body)), options)
+            self.stdout.write(
+                f'{name:>6}: encode {len(body) / encode / 2 ** 20:.0f} MiB/s, '
+                f'decode {len(body) / decode / 2 ** 20:.0f} MiB/s')
+
+    def _best(self, run, options):
+        timings = []
+        for _ in range(options['repeat']):
+            started = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - started)
+        return min(timings)
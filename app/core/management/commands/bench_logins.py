@@ -0,0 +1,58 @@
+"""Django command to measure login throughput under concurrency"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+
+from core import hashing
+from core.management.commands.benchmark import (
+    cleanup_users, login, report_output, run_requests, seed_users,
+    without_throttling, write_json)
+
+
+class Command(BaseCommand):
+    """Concurrent logins against the token endpoint, per hasher profile"""
+    help = ('Report logins/second, latency percentiles and 429s for '
+            'concurrent token requests under each hasher profile.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10)
+        parser.add_argument('--logins', type=int, default=100)
+        parser.add_argument('--concurrency', type=int, default=16)
+        parser.add_argument(
+            '--profile', action='append',
+            choices=sorted(settings.PASSWORD_HASHER_PROFILES),
+            help='Hasher profile(s) to compare; defaults to the active one.')
+        parser.add_argument('--json', dest='json_path',
+                            help="Write results as JSON to a file, or '-'.")
+
+    def handle(self, *args, **options):
+        results = {}
+        for name in options['profile'] or [settings.PASSWORD_HASHER_PROFILE]:
+            profile = settings.PASSWORD_HASHER_PROFILES[name]
+            with override_settings(
+                    PASSWORD_HASHERS=list(dict.fromkeys(
+                        profile['HASHERS'] + settings.PASSWORD_HASHERS)),
+                    PASSWORD_HASHER_COST=profile['COST']):
+                results[name] = self._run(options)
+            result = results[name]
+            report_output(self, options['json_path']).write(
+                f'{name:>12}: {result["rps"]:,.1f} logins/s  '
+                f'p50 {result["p50_ms"]:.1f} ms  '
+                f'p95 {result["p95_ms"]:.1f} ms  '
+                f'p99 {result["p99_ms"]:.1f} ms  '
+                f'{result["throttled"]} throttled  '
+                f'{result["errors"] - result["throttled"]} errors')
+
+        write_json(self, options['json_path'], results)
+
+    def _run(self, options):
+        users = seed_users(options['users'], 0, 0)
+        try:
+            with without_throttling():
+                result = run_requests(
+                    login, users, options['logins'], options['concurrency'])
+        finally:
+            cleanup_users(users)
+        result['hashing'] = hashing.executor.stats()
+        return result
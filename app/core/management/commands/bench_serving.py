@@ -0,0 +1,196 @@
+"""Django command to compare WSGI and ASGI serving under slow clients"""
+import asyncio
+import io
+import sys
+import threading
+import time
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand
+from django.core.wsgi import get_wsgi_application
+from django.db import connections
+from django.urls import reverse
+
+from core.management.commands.benchmark import (
+    bench_host, cleanup_users, percentile, report_output, seed_users,
+    write_json)
+
+
+class Command(BaseCommand):
+    """Throughput of one server mode with many concurrent slow clients"""
+    help = ('Drive the WSGI or ASGI application in-process with concurrent '
+            'clients that read responses slowly. Run once per mode, e.g. '
+            '"bench_serving --server wsgi" and, for the async views, '
+            '"API_ASYNC_READS=true bench_serving --server asgi".')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--server', choices=['wsgi', 'asgi'],
+                            default='wsgi')
+        parser.add_argument('--clients', type=int, default=50)
+        parser.add_argument('--requests', type=int, default=500)
+        parser.add_argument('--workers', type=int, default=4,
+                            help='WSGI worker threads.')
+        parser.add_argument('--client-delay', type=float, default=0.05,
+                            help='Seconds each client spends reading a '
+                                 'response.')
+        parser.add_argument('--users', type=int, default=10)
+        parser.add_argument('--recipes', type=int, default=50)
+        parser.add_argument('--json', dest='json_path',
+                            help="Write results as JSON to a file, or '-'.")
+
+    def handle(self, *args, **options):
+        users = seed_users(options['users'], options['recipes'], 3)
+        jobs = [
+            (reverse('recipe:recipe-list'), users[i % len(users)]['token'])
+            for i in range(options['requests'])
+        ]
+        clients = max(min(options['clients'], len(jobs)), 1)
+        batches = [jobs[i::clients] for i in range(clients)]
+        try:
+            started = time.perf_counter()
+            if options['server'] == 'wsgi':
+                samples = self._run_wsgi(
+                    batches, options['workers'], options['client_delay'])
+            else:
+                samples = async_to_sync(self._run_asgi)(
+                    batches, options['client_delay'])
+            wall = time.perf_counter() - started
+        finally:
+            cleanup_users(users)
+
+        latencies = sorted(elapsed * 1000 for elapsed, _ in samples)
+        result = {
+            'server': options['server'],
+            'async_reads': settings.API_ASYNC_READS,
+            'clients': clients,
+            'requests': len(samples),
+            'errors': sum(status >= 400 for _, status in samples),
+            'rps': round(len(samples) / wall, 1) if wall else 0.0,
+            'p50_ms': round(percentile(latencies, 50), 2),
+            'p95_ms': round(percentile(latencies, 95), 2),
+            'p99_ms': round(percentile(latencies, 99), 2),
+        }
+        report_output(self, options['json_path']).write(
+            f'{result["server"]} (async reads: {result["async_reads"]}): '
+            f'{result["rps"]:,.1f} req/s  p50 {result["p50_ms"]:.1f} ms  '
+            f'p95 {result["p95_ms"]:.1f} ms  p99 {result["p99_ms"]:.1f} ms  '
+            f'{result["errors"]} errors')
+        write_json(self, options['json_path'], result)
+
+    def _run_wsgi(self, batches, workers, delay):
+        """A thread per client sharing ``workers`` server threads."""
+        application = get_wsgi_application()
+        worker_slots = threading.Semaphore(workers)
+        samples = []
+
+        def request(path, token):
+            status = []
+            environ = {
+                'REQUEST_METHOD': 'GET',
+                'PATH_INFO': path,
+                'QUERY_STRING': '',
+                'SERVER_NAME': bench_host(),
+                'SERVER_PORT': '80',
+                'SERVER_PROTOCOL': 'HTTP/1.1',
+                'HTTP_HOST': bench_host(),
+                'HTTP_AUTHORIZATION': f'Token {token}',
+                'wsgi.input': io.BytesIO(),
+                'wsgi.errors': sys.stderr,
+                'wsgi.url_scheme': 'http',
+                'wsgi.multithread': True,
+                'wsgi.multiprocess': False,
+                'wsgi.run_once': False,
+            }
+            with worker_slots:
+                response = application(
+                    environ, lambda code, headers: status.append(code))
+                try:
+                    for _ in response:
+                        # The worker stays busy while the client reads.
+                        time.sleep(delay)
+                finally:
+                    response.close()
+            return int(status[0].split()[0])
+
+        def run(batch):
+            for path, token in batch:
+                started = time.perf_counter()
+                code = request(path, token)
+                samples.append((time.perf_counter() - started, code))
+
+        def client(batch):
+            try:
+                run(batch)
+            finally:
+                connections.close_all()
+
+        if len(batches) == 1:
+            run(batches[0])
+            return samples
+        threads = [threading.Thread(target=client, args=(batch,))
+                   for batch in batches]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return samples
+
+    async def _run_asgi(self, batches, delay):
+        """One event loop serving every client, like a uvicorn worker."""
+        application = get_asgi_application()
+        host = bench_host()
+
+        async def request(path, token):
+            status = []
+            done = asyncio.Event()
+            sent_request = False
+
+            async def receive():
+                nonlocal sent_request
+                if not sent_request:
+                    sent_request = True
+                    return {'type': 'http.request', 'body': b'',
+                            'more_body': False}
+                await done.wait()
+                return {'type': 'http.disconnect'}
+
+            async def send(message):
+                if message['type'] == 'http.response.start':
+                    status.append(message['status'])
+                elif message['type'] == 'http.response.body':
+                    # The client reads slowly without holding a thread.
+                    await asyncio.sleep(delay)
+                    if not message.get('more_body'):
+                        done.set()
+
+            await application({
+                'type': 'http',
+                'asgi': {'version': '3.0'},
+                'http_version': '1.1',
+                'method': 'GET',
+                'scheme': 'http',
+                'path': path,
+                'raw_path': path.encode(),
+                'query_string': b'',
+                'root_path': '',
+                'headers': [
+                    (b'host', host.encode()),
+                    (b'authorization', f'Token {token}'.encode()),
+                ],
+                'client': ('127.0.0.1', 0),
+                'server': (host, 80),
+            }, receive, send)
+            return status[0]
+
+        async def client(batch):
+            samples = []
+            for path, token in batch:
+                started = time.perf_counter()
+                code = await request(path, token)
+                samples.append((time.perf_counter() - started, code))
+            return samples
+
+        results = await asyncio.gather(*(client(batch) for batch in batches))
+        return [sample for samples in results for sample in samples]
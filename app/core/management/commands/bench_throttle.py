@@ -0,0 +1,72 @@
+"""Django command to measure the overhead of a throttle check"""
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory, override_settings
+from rest_framework.request import Request
+from rest_framework.views import APIView
+
+from core.management.commands.benchmark import report_output, write_json
+from core.throttling import (
+    CacheBucketStore, LocalBucketStore, LoginIPThrottle)
+
+
+class Command(BaseCommand):
+    """Microseconds per throttle check for each bucket store"""
+    help = ('Time raw bucket updates and full LoginIPThrottle checks against '
+            'the in-process store and each configured cache.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20000)
+        parser.add_argument('--keys', type=int, default=1000,
+                            help='Distinct client addresses to rotate over.')
+        parser.add_argument('--json', dest='json_path',
+                            help="Write results as JSON to a file, or '-'.")
+
+    def handle(self, *args, **options):
+        stores = {'local': LocalBucketStore()}
+        for alias in settings.CACHES:
+            stores[f'cache:{alias}'] = CacheBucketStore(caches[alias])
+
+        results = {}
+        for name, store in stores.items():
+            results[name] = {
+                'store_us': self._time_store(store, options),
+                'throttle_us': self._time_throttle(store, options),
+            }
+            report_output(self, options['json_path']).write(
+                f'{name:>16}: {results[name]["store_us"]:>8.2f} us/bucket  '
+                f'{results[name]["throttle_us"]:>8.2f} us/check')
+
+        write_json(self, options['json_path'], results)
+
+    def _time_store(self, store, options):
+        keys = [f'bench-throttle-{i}' for i in range(options['keys'])]
+        started = time.perf_counter()
+        for i in range(options['iterations']):
+            store.consume(keys[i % len(keys)], 1000.0, 1000)
+        return self._per_call(started, options['iterations'])
+
+    def _time_throttle(self, store, options):
+        factory = RequestFactory()
+        requests = [
+            Request(factory.post('/', REMOTE_ADDR=f'10.0.{i // 256}.{i % 256}'))
+            for i in range(options['keys'])
+        ]
+        view = APIView()
+        rates = {**settings.REST_FRAMEWORK,
+                 'DEFAULT_THROTTLE_RATES': {'login_ip': '100000/min'}}
+        throttle_class = type(
+            'BenchThrottle', (LoginIPThrottle,), {'store': store})
+        with override_settings(REST_FRAMEWORK=rates):
+            started = time.perf_counter()
+            for i in range(options['iterations']):
+                throttle_class().allow_request(
+                    requests[i % len(requests)], view)
+            return self._per_call(started, options['iterations'])
+
+    def _per_call(self, started, iterations):
+        elapsed = time.perf_counter() - started
+        return round(elapsed / max(iterations, 1) * 1e6, 2)
@@ -0,0 +1,263 @@
+"""Django command to benchmark the API endpoints in-process"""
+import itertools
+import json
+import math
+import secrets
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, connections
+from django.test import Client, override_settings
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+
+from core.models import Recipe, Tag
+from core.signals import recipes_bulk_changed
+
+
+BENCH_PASSWORD = 'bench-password'
+BENCH_EMAIL = 'bench-{run}-{i}@example.com'
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not values:
+        return 0.0
+    rank = max(math.ceil(pct / 100 * len(values)), 1)
+    return values[rank - 1]
+
+
+def bench_host():
+    """A host name the test client may use under ALLOWED_HOSTS."""
+    hosts = [host.lstrip('.') for host in settings.ALLOWED_HOSTS
+             if '*' not in host]
+    return hosts[0] if hosts else 'localhost'
+
+
+def seed_users(user_count, recipe_count, tag_count):
+    """
+    Create benchmark users with recipes, tags and tokens. Their emails are
+    unique to this run, so they never collide with existing accounts.
+    """
+    run = secrets.token_hex(4)
+    users = []
+    for i in range(user_count):
+        user = get_user_model().objects.create_user(
+            BENCH_EMAIL.format(run=run, i=i), BENCH_PASSWORD,
+            name=f'bench {i}')
+        tags = Tag.objects.bulk_create([
+            Tag(user=user, name=f'tag {j}') for j in range(tag_count)])
+        recipes = Recipe.objects.bulk_create([
+            Recipe(user=user, title=f'recipe {j}', time_minutes=j % 120,
+                   price='9.99', link='http://example.com')
+            for j in range(recipe_count)
+        ])
+        Recipe.tags.through.objects.bulk_create([
+            Recipe.tags.through(recipe_id=recipe.id, tag_id=tag.id)
+            for recipe in recipes for tag in tags
+        ])
+        recipes_bulk_changed.send(sender=Recipe, user=user)
+        users.append({
+            'id': user.id,
+            'email': user.email,
+            'token': Token.objects.create(user=user).key,
+            'recipe_id': recipes[0].id if recipes else 0,
+        })
+    return users
+
+
+def without_throttling():
+    """Drop the throttle rates so the load is not answered with 429s."""
+    return override_settings(REST_FRAMEWORK={
+        **settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': {}})
+
+
+def cleanup_users(users):
+    """Delete the users ``seed_users`` created, and nobody else."""
+    get_user_model().objects.filter(
+        pk__in=[user['id'] for user in users]).delete()
+
+
+def report_output(command, json_path):
+    """
+    Where ``command`` writes its human-readable report: stderr when the
+    JSON goes to stdout, so stdout stays parseable.
+    """
+    if json_path != '-':
+        return command.stdout
+    command.stderr.style_func = None
+    return command.stderr
+
+
+def write_json(command, json_path, results):
+    """Write ``results`` as JSON to ``json_path``, stdout for '-'."""
+    if not json_path:
+        return
+    output = json.dumps(results, indent=2, sort_keys=True)
+    if json_path == '-':
+        command.stdout.write(output)
+    else:
+        with open(json_path, 'w') as f:
+            f.write(output + '\n')
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def login(client, user):
+    return client.post(reverse('user:token'), {
+        'email': user['email'], 'password': BENCH_PASSWORD,
+    }, content_type='application/json')
+
+
+def run_requests(make_request, users, total, concurrency):
+    """Send ``total`` requests from ``concurrency`` threads and summarise."""
+    cycle = itertools.cycle(users)
+    jobs = [next(cycle) for _ in range(total)]
+
+    def call(user):
+        client = Client(
+            SERVER_NAME=bench_host(),
+            HTTP_AUTHORIZATION=f'Token {user["token"]}')
+        counter = QueryCounter()
+        started = time.perf_counter()
+        with connection.execute_wrapper(counter):
+            response = make_request(client, user)
+        elapsed = time.perf_counter() - started
+        return elapsed, counter.count, response.status_code
+
+    def worker(chunk):
+        try:
+            return [call(user) for user in chunk]
+        finally:
+            connections.close_all()
+
+    started = time.perf_counter()
+    if concurrency > 1:
+        chunks = [jobs[i::concurrency] for i in range(concurrency)]
+        with ThreadPoolExecutor(concurrency) as pool:
+            samples = list(itertools.chain.from_iterable(
+                pool.map(worker, chunks)))
+    else:
+        samples = [call(user) for user in jobs]
+    wall = time.perf_counter() - started
+
+    latencies = sorted(elapsed * 1000 for elapsed, _, _ in samples)
+    return {
+        'requests': len(samples),
+        'errors': sum(status >= 400 for _, _, status in samples),
+        'throttled': sum(status == 429 for _, _, status in samples),
+        'rps': round(len(samples) / wall, 1) if wall else 0.0,
+        'p50_ms': round(percentile(latencies, 50), 2),
+        'p95_ms': round(percentile(latencies, 95), 2),
+        'p99_ms': round(percentile(latencies, 99), 2),
+        'queries_per_request': round(
+            sum(queries for _, queries, _ in samples) / len(samples), 2),
+    }
+
+
+def recipe_list(client, user):
+    return client.get(reverse('recipe:recipe-list'))
+
+
+def recipe_detail(client, user):
+    return client.get(
+        reverse('recipe:recipe-detail', args=[user['recipe_id']]))
+
+
+def recipe_create(client, user):
+    return client.post(reverse('recipe:recipe-list'), {
+        'title': 'Bench recipe',
+        'time_minutes': 10,
+        'price': '4.50',
+        'tags': [{'name': 'bench'}],
+    }, content_type='application/json')
+
+
+SCENARIOS = {
+    'recipe-list': recipe_list,
+    'recipe-detail': recipe_detail,
+    'tag-list': lambda client, user: client.get(reverse('recipe:tag-list')),
+    'recipe-stats': lambda client, user: client.get(reverse('recipe:stats')),
+    'user-me': lambda client, user: client.get(reverse('user:me')),
+    'user-list': lambda client, user: client.get(reverse('user:list')),
+    'token': login,
+    'recipe-create': recipe_create,
+}
+
+
+class Command(BaseCommand):
+    """Seed users, recipes and tags, then load the API concurrently"""
+    help = ('Report latency percentiles, queries per request and requests '
+            'per second for the recipe, tag, token and user endpoints.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10)
+        parser.add_argument('--recipes', type=int, default=100,
+                            help='Recipes per user.')
+        parser.add_argument('--tags', type=int, default=5,
+                            help='Tags per user, all attached to each recipe.')
+        parser.add_argument('--requests', type=int, default=200,
+                            help='Requests per scenario.')
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument('--scenario', action='append',
+                            choices=sorted(SCENARIOS),
+                            help='Only run the named scenario(s).')
+        parser.add_argument('--json', dest='json_path',
+                            help="Write results as JSON to a file, or '-'.")
+        parser.add_argument('--keep', action='store_true',
+                            help='Keep the seeded rows afterwards.')
+        parser.add_argument('--throttle', action='store_true',
+                            help='Keep the configured throttle rates.')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        users = seed_users(options['users'], options['recipes'],
+                           options['tags'])
+        seed_seconds = time.perf_counter() - started
+
+        scenarios = SCENARIOS
+        if options['scenario']:
+            scenarios = {name: SCENARIOS[name] for name in options['scenario']}
+        results = {}
+        throttling = nullcontext() if options['throttle'] else (
+            without_throttling())
+        try:
+            with throttling:
+                for name, make_request in scenarios.items():
+                    results[name] = run_requests(
+                        make_request, users, options['requests'],
+                        options['concurrency'])
+                    self._report(report_output(self, options['json_path']),
+                                 name, results[name])
+        finally:
+            if not options['keep']:
+                cleanup_users(users)
+
+        write_json(self, options['json_path'], {
+            'parameters': {
+                key: options[key] for key in
+                ('users', 'recipes', 'tags', 'requests', 'concurrency')
+            },
+            'database': connection.vendor,
+            'seed_seconds': round(seed_seconds, 3),
+            'scenarios': results,
+        })
+
+    def _report(self, out, name, result):
+        out.write(
+            f'{name:>14}: {result["rps"]:>8,.1f} req/s  '
+            f'p50 {result["p50_ms"]:.1f} ms  p95 {result["p95_ms"]:.1f} ms  '
+            f'p99 {result["p99_ms"]:.1f} ms  '
+            f'{result["queries_per_request"]:.1f} queries  '
+            f'{result["errors"]} errors')
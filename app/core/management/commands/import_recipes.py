@@ -0,0 +1,216 @@
+"""Django command to stream recipe dumps into the database"""
+import csv
+import io
+import json
+import sys
+import time
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from core.models import Recipe, Tag
+from core.signals import recipes_bulk_changed
+
+
+RECIPE_FIELDS = ['title', 'description', 'time_minutes', 'price', 'link']
+
+
+def read_rows(stream, fmt):
+    """Yield raw row dicts from an NDJSON or CSV stream (as exported)."""
+    if fmt == 'csv':
+        for row in csv.DictReader(stream):
+            tags = row.get('tags') or ''
+            row['tags'] = [name for name in tags.split('|') if name]
+            yield row
+    else:
+        for line in stream:
+            if line.strip():
+                yield json.loads(line)
+
+
+class Command(BaseCommand):
+    """Import NDJSON/CSV recipe dumps in batches"""
+    help = 'Stream recipes from an NDJSON or CSV dump into the database.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Dump file, or '-' for stdin.")
+        parser.add_argument(
+            '--user', help='Owner email for rows without a "user" field.')
+        parser.add_argument('--format', choices=['ndjson', 'csv'])
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--offset', type=int, default=0,
+            help='Skip this many rows, e.g. to resume an interrupted import.')
+        parser.add_argument(
+            '--copy', action='store_true',
+            help='Load batches with PostgreSQL COPY through staging tables.')
+
+    def handle(self, *args, **options):
+        if options['copy'] and connection.vendor != 'postgresql':
+            raise CommandError('--copy requires PostgreSQL.')
+        fmt = options['format'] or (
+            'csv' if options['path'].endswith('.csv') else 'ndjson')
+        self.users = {}
+        self.tag_ids = {}
+        self.default_user = (
+            self._get_user(options['user']) if options['user'] else None)
+        write_batch = self._copy_batch if options['copy'] else self._orm_batch
+
+        stream = (sys.stdin if options['path'] == '-'
+                  else open(options['path'], newline=''))
+        imported = 0
+        offset = options['offset']
+        started = time.monotonic()
+        try:
+            rows = islice(read_rows(stream, fmt), offset, None)
+            while True:
+                batch = list(islice(rows, options['batch_size']))
+                if not batch:
+                    break
+                recipes = [
+                    self._parse(row, offset + imported + number)
+                    for number, row in enumerate(batch, start=1)
+                ]
+                with transaction.atomic():
+                    write_batch(recipes)
+                imported += len(recipes)
+                self.stdout.write(
+                    f'{imported} rows imported '
+                    f'({imported / (time.monotonic() - started):.0f} rows/s), '
+                    f'resume with --offset {offset + imported}'
+                )
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+            for user in self.users.values():
+                recipes_bulk_changed.send(sender=Recipe, user=user)
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {imported} recipes in {elapsed:.1f}s '
+            f'({imported / elapsed if elapsed else 0:.0f} rows/s)'
+        ))
+
+    def _get_user(self, email):
+        if email not in self.users:
+            try:
+                self.users[email] = get_user_model().objects.get(email=email)
+            except get_user_model().DoesNotExist:
+                raise CommandError(f'Unknown user {email!r}.')
+        return self.users[email]
+
+    def _parse(self, row, number):
+        """
+        Build the row's unsaved Recipe, validated against the model fields
+        (lengths, price digits, finite numbers) so a bad row is reported by
+        number instead of failing its batch in the database.
+        """
+        try:
+            user = (self._get_user(row['user']) if row.get('user')
+                    else self.default_user)
+            if user is None:
+                raise ValueError('no owner, pass --user')
+            recipe = Recipe(
+                user=user,
+                title=row.get('title') or '',
+                description=row.get('description') or '',
+                time_minutes=row['time_minutes'],
+                price=row['price'],
+                link=row.get('link') or '',
+            )
+            recipe.full_clean(exclude=['user'], validate_unique=False)
+            tags = [tag['name'] if isinstance(tag, dict) else tag
+                    for tag in row.get('tags') or []]
+            for name in tags:
+                self._clean_tag_name(name)
+        except ValidationError as exc:
+            errors = '; '.join(
+                f'{field}: {" ".join(messages)}'
+                for field, messages in exc.message_dict.items())
+            raise CommandError(f'Row {number}: {errors}')
+        except (KeyError, ValueError, TypeError) as exc:
+            raise CommandError(f'Row {number}: {exc}')
+        return recipe, tags
+
+    def _clean_tag_name(self, name):
+        try:
+            Tag._meta.get_field('name').clean(name, None)
+        except ValidationError as exc:
+            raise ValidationError({'tags': exc.messages})
+
+    def _resolve_tags(self, recipes):
+        """Map tag names to ids, querying only names not seen before."""
+        missing = {}
+        for recipe, tags in recipes:
+            for name in tags:
+                if (recipe.user.id, name) not in self.tag_ids:
+                    missing.setdefault(recipe.user, set()).add(name)
+        for user, names in missing.items():
+            for tag in Tag.objects.get_or_create_many(user, sorted(names)):
+                self.tag_ids[(user.id, tag.name)] = tag.id
+
+    def _tag_rows(self, recipes):
+        return {
+            (recipe.id, self.tag_ids[(recipe.user.id, name)])
+            for recipe, tags in recipes for name in tags
+        }
+
+    def _orm_batch(self, recipes):
+        Recipe.objects.bulk_create([recipe for recipe, _ in recipes])
+        self._resolve_tags(recipes)
+        through = Recipe.tags.through
+        through.objects.bulk_create(
+            [through(recipe_id=recipe_id, tag_id=tag_id)
+             for recipe_id, tag_id in self._tag_rows(recipes)],
+            ignore_conflicts=True
+        )
+
+    def _copy_batch(self, recipes):
+        recipe_table = Recipe._meta.db_table
+        tags_table = Recipe.tags.through._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT nextval(pg_get_serial_sequence(%s, %s)) '
+                'FROM generate_series(1, %s)',
+                [recipe_table, 'id', len(recipes)]
+            )
+            for (recipe, _), (pk,) in zip(recipes, cursor.fetchall()):
+                recipe.id = pk
+            self._resolve_tags(recipes)
+
+            cursor.execute(
+                f'CREATE TEMP TABLE IF NOT EXISTS import_recipe_staging '
+                f'(LIKE {recipe_table} INCLUDING DEFAULTS) ON COMMIT DROP')
+            cursor.execute(
+                'CREATE TEMP TABLE IF NOT EXISTS import_recipe_tags_staging '
+                '(recipe_id bigint, tag_id bigint) ON COMMIT DROP')
+            cursor.execute(
+                'TRUNCATE import_recipe_staging, import_recipe_tags_staging')
+            columns = ['id', 'user_id'] + RECIPE_FIELDS
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            for recipe, _ in recipes:
+                writer.writerow(
+                    [getattr(recipe, column) for column in columns])
+            buffer.seek(0)
+            cursor.copy_expert(
+                f'COPY import_recipe_staging ({", ".join(columns)}) '
+                f'FROM STDIN WITH (FORMAT csv, '
+                f'FORCE_NOT_NULL ({", ".join(RECIPE_FIELDS)}))', buffer)
+            buffer = io.StringIO()
+            csv.writer(buffer).writerows(self._tag_rows(recipes))
+            buffer.seek(0)
+            cursor.copy_expert(
+                'COPY import_recipe_tags_staging (recipe_id, tag_id) '
+                'FROM STDIN WITH (FORMAT csv)', buffer)
+
+            cursor.execute(
+                f'INSERT INTO {recipe_table} ({", ".join(columns)}) '
+                f'SELECT {", ".join(columns)} FROM import_recipe_staging')
+            cursor.execute(
+                f'INSERT INTO {tags_table} (recipe_id, tag_id) '
+                f'SELECT recipe_id, tag_id FROM import_recipe_tags_staging '
+                f'ON CONFLICT DO NOTHING')
@@ -0,0 +1,36 @@
+"""Django command to rebuild the recipe and tag statistics"""
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from core import stats
+
+
+class Command(BaseCommand):
+    """Recompute every user's summary rows from their recipes and tags"""
+    help = ('Rebuild the per-user recipe and tag statistics from scratch, '
+            'e.g. after writes that bypassed signals.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', action='append', dest='emails',
+                            help='Only rebuild this user (repeatable).')
+
+    def handle(self, *args, **options):
+        users = get_user_model().objects.order_by('id')
+        if options['emails']:
+            users = users.filter(email__in=options['emails'])
+            missing = set(options['emails']) - set(
+                users.values_list('email', flat=True))
+            if missing:
+                raise CommandError(
+                    f'Unknown user(s): {", ".join(sorted(missing))}')
+
+        started = time.monotonic()
+        rebuilt = 0
+        for user_id in users.values_list('id', flat=True).iterator():
+            stats.rebuild_user(user_id)
+            rebuilt += 1
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt statistics for {rebuilt} users in '
+            f'{time.monotonic() - started:.1f}s'))
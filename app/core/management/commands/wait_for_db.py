@@ -1,23 +1,94 @@
-"""DJANGO COMMAND TO WAIT FOR DB TO BE AVALIBLE"""
+"""DJANGO COMMAND TO WAIT FOR THE DATABASES AND CACHES TO BE AVAILABLE"""
+import random
 import time
-from django.core.management.base import BaseCommand
-from psycopg2 import OperationalError as Psycopg2Error
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
 from django.db.utils import OperationalError
+from psycopg2 import OperationalError as Psycopg2Error
 
 
 class Command(BaseCommand):
-    """COMMAND TO WAIT FOR DJANGOP TO WAIT FOR DATABASE"""
+    """COMMAND TO WAIT FOR EVERY DATABASE AND CACHE, PROBED CONCURRENTLY"""
 
-    def handle(self, *args, **options):
-        self.stdout.write('Waiting for Database')
-        db_up = False
-        while db_up is False:
+    def add_arguments(self, parser):
+        parser.add_argument('--timeout', type=float, default=60,
+                            help='Give up after this many seconds.')
+        parser.add_argument('--initial-delay', type=float, default=0.1)
+        parser.add_argument('--max-delay', type=float, default=5)
+        parser.add_argument('--skip-caches', action='store_true')
+
+    def probe_database(self, alias):
+        """Open a connection and run one trivial query."""
+        connection = connections[alias]
+        try:
+            connection.ensure_connection()
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+        finally:
+            connection.close()
+
+    def probe_cache(self, alias):
+        cache = caches[alias]
+        cache.set('wait-for-db-probe', 1, 5)
+        cache.get('wait-for-db-probe')
+
+    def wait_for(self, name, probe, errors, options):
+        """Retry ``probe`` with exponential backoff and jitter."""
+        started = time.monotonic()
+        deadline = started + options['timeout']
+        delay = options['initial_delay']
+        while True:
             try:
-                self.check(databases=['default'])
-                db_up = True
-            except (Psycopg2Error, OperationalError):
+                probe()
+                return time.monotonic() - started
+            except errors as exc:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise CommandError(
+                        f'{name} unavailable after {options["timeout"]}s: '
+                        f'{exc}')
+                pause = min(delay / 2 + random.uniform(0, delay / 2),
+                            remaining)
                 self.stdout.write(
-                    'database unavalible, waiting 1 second...'
-                )
-                time.sleep(1)
-        self.stdout.write(self.style.SUCCESS('DATABASE AVALIBLE'))
+                    f'{name} unavailable, waiting {pause:.2f} seconds...')
+                time.sleep(pause)
+                delay = min(delay * 2, options['max_delay'])
+
+    def handle(self, *args, **options):
+        self.stdout.write('Waiting for Database')
+        started = time.monotonic()
+        targets = [
+            (f'database {alias}', lambda alias=alias: self.probe_database(
+                alias), (Psycopg2Error, OperationalError))
+            for alias in connections
+        ]
+        if not options['skip_caches']:
+            targets += [
+                (f'cache {alias}', lambda alias=alias: self.probe_cache(
+                    alias), Exception)
+                for alias in settings.CACHES
+            ]
+
+        with ThreadPoolExecutor(len(targets)) as pool:
+            futures = [
+                (name, pool.submit(self.wait_for, name, probe, errors,
+                                   options))
+                for name, probe, errors in targets
+            ]
+            failures = []
+            for name, future in futures:
+                try:
+                    elapsed = future.result()
+                except CommandError as exc:
+                    failures.append(str(exc))
+                else:
+                    self.stdout.write(f'{name} ready after {elapsed:.2f}s')
+        if failures:
+            raise CommandError('\n'.join(failures))
+
+        self.stdout.write(self.style.SUCCESS(
+            f'DATABASE AVAILABLE in {time.monotonic() - started:.2f}s'))
@@ -0,0 +1,58 @@
+"""In-process metrics collected per worker and served by MetricsView."""
+import threading
+from collections import defaultdict
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sources = {}
+        self._endpoints = defaultdict(self._empty_endpoint)
+
+    @staticmethod
+    def _empty_endpoint():
+        return {
+            'requests': 0,
+            'total_ms': 0.0,
+            'max_ms': 0.0,
+            'db_ms': 0.0,
+            'queries': 0,
+            'render_ms': 0.0,
+            'bytes': 0,
+            'n_plus_one': 0,
+        }
+
+    def register(self, name, source):
+        """Include ``source()`` under ``name`` in every snapshot."""
+        self._sources[name] = source
+
+    def record_request(self, endpoint, profile):
+        with self._lock:
+            stats = self._endpoints[endpoint]
+            stats['requests'] += 1
+            stats['total_ms'] += profile.total_ms
+            stats['max_ms'] = max(stats['max_ms'], profile.total_ms)
+            stats['db_ms'] += profile.db_ms
+            stats['queries'] += profile.queries
+            stats['render_ms'] += profile.render_ms
+            stats['bytes'] += profile.size or 0
+            if profile.repeated_sql:
+                stats['n_plus_one'] += 1
+                stats['last_n_plus_one_sql'] = profile.repeated_sql
+
+    def snapshot(self):
+        with self._lock:
+            endpoints = {
+                endpoint: dict(stats)
+                for endpoint, stats in self._endpoints.items()
+            }
+        snapshot = {name: source() for name, source in self._sources.items()}
+        snapshot['endpoints'] = endpoints
+        return snapshot
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+
+registry = Registry()
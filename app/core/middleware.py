@@ -0,0 +1,147 @@
+"""Per-request profiling with SQL instrumentation."""
+import logging
+import random
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from core.metrics import registry
+
+
+logger = logging.getLogger(__name__)
+
+# The profile of the request running in this context. Context variables
+# follow the request into sync_to_async threads, where the ORM runs under
+# ASGI, unlike wrappers installed on the event loop thread's connections.
+current_profile = ContextVar('current_profile', default=None)
+
+
+def profile_queries(execute, sql, params, many, context):
+    """Execute wrapper on every connection, feeding the current profile."""
+    profile = current_profile.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+    return profile(execute, sql, params, many, context)
+
+
+def install_query_profiler(sender, connection, **kwargs):
+    """connection_created receiver adding profile_queries once per wrapper."""
+    if profile_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(profile_queries)
+
+
+class RequestProfile:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.total_ms = 0.0
+        self.db_ms = 0.0
+        self.queries = 0
+        self.render_ms = 0.0
+        self.size = None
+        self.repeated_sql = None
+        self.statements = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        """Database execute wrapper timing every query."""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_ms += (time.perf_counter() - started) * 1000
+            self.queries += 1
+            self.statements[sql] += 1
+
+    def finish(self, response, threshold):
+        self.total_ms = (time.perf_counter() - self.started) * 1000
+        if not response.streaming:
+            self.size = len(response.content)
+        if self.statements:
+            sql, count = self.statements.most_common(1)[0]
+            if count >= threshold:
+                self.repeated_sql = sql
+
+    def server_timing(self):
+        app_ms = max(self.total_ms - self.db_ms - self.render_ms, 0)
+        return ', '.join([
+            f'total;dur={self.total_ms:.1f}',
+            f'db;dur={self.db_ms:.1f};desc="{self.queries} queries"',
+            f'render;dur={self.render_ms:.1f}',
+            f'app;dur={app_ms:.1f}',
+        ])
+
+
+class ProfilingMiddleware:
+    """
+    Profile a sample of requests: wall time, query count and time, template
+    response render (content encoding) time and response size. Results are sent as a
+    Server-Timing header and aggregated per endpoint in core.metrics.
+    Identical SQL repeated N_PLUS_ONE_THRESHOLD times is logged as a
+    likely N+1.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        profile = self._start(request)
+        if profile is None:
+            return self.get_response(request)
+        with self._instrument(profile):
+            response = self.get_response(request)
+        return self._finish(request, response, profile)
+
+    async def __acall__(self, request):
+        profile = self._start(request)
+        if profile is None:
+            return await self.get_response(request)
+        with self._instrument(profile):
+            response = await self.get_response(request)
+        return self._finish(request, response, profile)
+
+    def _start(self, request):
+        if random.random() >= settings.PROFILING['SAMPLE_RATE']:
+            return None
+        request.profile = RequestProfile()
+        return request.profile
+
+    @contextmanager
+    def _instrument(self, profile):
+        token = current_profile.set(profile)
+        try:
+            yield
+        finally:
+            current_profile.reset(token)
+
+    def _finish(self, request, response, profile):
+        profile.finish(response, settings.PROFILING['N_PLUS_ONE_THRESHOLD'])
+        response['Server-Timing'] = profile.server_timing()
+        match = request.resolver_match
+        endpoint = f'{request.method} {match.view_name if match else "unresolved"}'
+        registry.record_request(endpoint, profile)
+        if profile.repeated_sql:
+            logger.warning('Possible N+1 on %s: %s', endpoint,
+                           profile.repeated_sql)
+        return response
+
+    def process_template_response(self, request, response):
+        profile = getattr(request, 'profile', None)
+        if profile is not None:
+            started = time.perf_counter()
+
+            def rendered(response):
+                profile.render_ms = (time.perf_counter() - started) * 1000
+
+            response.add_post_render_callback(rendered)
+        return response
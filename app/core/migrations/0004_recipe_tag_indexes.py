@@ -0,0 +1,43 @@
+# Generated by Django 4.2 on 2026-10-18 15:47
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def merge_duplicate_tags(apps, schema_editor):
+    Tag = apps.get_model('core', 'Tag')
+    Recipe = apps.get_model('core', 'Recipe')
+    through = Recipe.tags.through
+    duplicates = Tag.objects.values('user_id', 'name').annotate(
+        keep=Min('id'), count=Count('id')).filter(count__gt=1)
+    for duplicate in duplicates:
+        others = Tag.objects.filter(
+            user_id=duplicate['user_id'], name=duplicate['name']
+        ).exclude(id=duplicate['keep'])
+        recipe_ids = set(through.objects.filter(
+            tag__in=others).values_list('recipe_id', flat=True))
+        through.objects.bulk_create(
+            [through(recipe_id=recipe_id, tag_id=duplicate['keep'])
+             for recipe_id in recipe_ids],
+            ignore_conflicts=True
+        )
+        others.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_tag_recipe_tags'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(fields=['user', '-id'], name='recipe_user_id_desc_idx'),
+        ),
+        migrations.RunPython(merge_duplicate_tags, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='tag',
+            constraint=models.UniqueConstraint(fields=('user', 'name'), name='tag_unique_user_name'),
+        ),
+    ]
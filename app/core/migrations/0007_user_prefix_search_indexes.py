@@ -0,0 +1,43 @@
+from django.db import migrations
+
+
+# istartswith compiles to UPPER(col::text) LIKE UPPER(%s) on PostgreSQL;
+# text_pattern_ops lets these indexes serve that LIKE under any collation.
+# Built concurrently so the user table stays writable; other backends skip
+# them.
+ADD_PREFIX_INDEXES = [
+    'CREATE INDEX CONCURRENTLY IF NOT EXISTS user_email_upper_prefix_idx '
+    'ON core_user (UPPER(email::text) text_pattern_ops)',
+    'CREATE INDEX CONCURRENTLY IF NOT EXISTS user_name_upper_prefix_idx '
+    'ON core_user (UPPER(name::text) text_pattern_ops)',
+]
+
+DROP_PREFIX_INDEXES = [
+    'DROP INDEX CONCURRENTLY IF EXISTS user_email_upper_prefix_idx',
+    'DROP INDEX CONCURRENTLY IF EXISTS user_name_upper_prefix_idx',
+]
+
+
+def add_prefix_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        for sql in ADD_PREFIX_INDEXES:
+            schema_editor.execute(sql)
+
+
+def drop_prefix_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        for sql in DROP_PREFIX_INDEXES:
+            schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('core', '0006_recipe_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_prefix_indexes, drop_prefix_indexes),
+    ]
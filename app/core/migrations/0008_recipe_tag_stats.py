@@ -0,0 +1,71 @@
+# Generated by Django 4.2 on 2026-10-18 17:05
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Max, Min, Sum
+import django.db.models.deletion
+
+
+def backfill_stats(apps, schema_editor):
+    Recipe = apps.get_model('core', 'Recipe')
+    RecipeStats = apps.get_model('core', 'RecipeStats')
+    Tag = apps.get_model('core', 'Tag')
+    TagStats = apps.get_model('core', 'TagStats')
+    RecipeStats.objects.bulk_create([
+        RecipeStats(
+            user_id=row['user_id'],
+            recipe_count=row['recipe_count'],
+            total_time_minutes=row['total_time_minutes'],
+            total_price=row['total_price'],
+            min_price=row['min_price'],
+            max_price=row['max_price'],
+        )
+        for row in Recipe.objects.values('user_id').annotate(
+            recipe_count=Count('id'),
+            total_time_minutes=Sum('time_minutes'),
+            total_price=Sum('price'),
+            min_price=Min('price'),
+            max_price=Max('price'),
+        ).order_by()
+    ], batch_size=1000)
+    TagStats.objects.bulk_create([
+        TagStats(tag_id=row['id'], user_id=row['user_id'],
+                 recipe_count=row['recipe_count'])
+        for row in Tag.objects.annotate(
+            recipe_count=Count('recipe')).values(
+            'id', 'user_id', 'recipe_count')
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_user_prefix_search_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecipeStats',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('recipe_count', models.IntegerField(default=0)),
+                ('total_time_minutes', models.BigIntegerField(default=0)),
+                ('total_price', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('min_price', models.DecimalField(decimal_places=2, max_digits=5, null=True)),
+                ('max_price', models.DecimalField(decimal_places=2, max_digits=5, null=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='TagStats',
+            fields=[
+                ('tag', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, serialize=False, to='core.tag')),
+                ('recipe_count', models.IntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='tagstats',
+            index=models.Index(fields=['user', '-recipe_count'], name='tagstats_user_count_idx'),
+        ),
+        migrations.RunPython(backfill_stats, migrations.RunPython.noop),
+    ]
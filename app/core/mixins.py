@@ -0,0 +1,31 @@
+"""View mixins shared across the API apps."""
+from rest_framework.permissions import SAFE_METHODS
+
+from core.routers import is_pinned, pin_to_primary, replica_reads
+
+
+class ReplicaReadMixin:
+    """
+    Serve safe-method requests from a read replica. Successful writes pin
+    the user to the primary for a short while so they read their writes.
+    Authentication always runs against the primary.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        token = replica_reads.set(False)
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            replica_reads.reset(token)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method in SAFE_METHODS and not (
+                request.user.is_authenticated and is_pinned(request.user.pk)):
+            replica_reads.set(True)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        wrote = request.method not in SAFE_METHODS
+        if wrote and response.status_code < 400 and request.user.is_authenticated:
+            pin_to_primary(request.user.pk)
+        return super().finalize_response(request, response, *args, **kwargs)
@@ -6,6 +6,8 @@ from django.contrib.auth.models import (
 )
 from django.conf import settings
 
+from core import hashing
+
 
 class UserManager(BaseUserManager):
     def create_user(self, email, password=None, **extra_field):
@@ -32,6 +34,20 @@ class User(AbstractBaseUser, PermissionsMixin):
     objects = UserManager()
     USERNAME_FIELD = 'email'
 
+    def set_password(self, raw_password):
+        self.password = hashing.executor.make_password(raw_password)
+        self._password = raw_password
+
+    def check_password(self, raw_password):
+        def setter(raw_password):
+            self.set_password(raw_password)
+            # Password hash upgrades shouldn't be considered password changes.
+            self._password = None
+            self.save(update_fields=['password'])
+
+        return hashing.executor.check_password(
+            raw_password, self.password, setter)
+
 
 class Recipe(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL,
@@ -43,14 +59,90 @@ class Recipe(models.Model):
     link = models.CharField(max_length=255, blank=True)
     tags = models.ManyToManyField('Tag')
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', '-id'], name='recipe_user_id_desc_idx'),
+            models.Index(fields=['user', 'price'], name='recipe_user_price_idx'),
+            models.Index(fields=['user', 'time_minutes'],
+                         name='recipe_user_time_idx'),
+        ]
+
     def __str__(self):
         return self.title
 
 
+class TagManager(models.Manager):
+    def get_or_create_many(self, user, names):
+        """Return the user's tags for names, creating missing ones in bulk."""
+        names = list(dict.fromkeys(names))
+        tags = {tag.name: tag for tag in self.filter(user=user, name__in=names)}
+        missing = [name for name in names if name not in tags]
+        if missing:
+            # Rows inserted concurrently by another request are skipped here
+            # and picked up by the second lookup.
+            self.bulk_create(
+                [self.model(user=user, name=name) for name in missing],
+                ignore_conflicts=True
+            )
+            tags.update({
+                tag.name: tag
+                for tag in self.filter(user=user, name__in=missing)
+            })
+        return [tags[name] for name in names]
+
+
 class Tag(models.Model):
     name = models.CharField(max_length=255)
     user = models.ForeignKey(settings.AUTH_USER_MODEL,
                              on_delete=models.CASCADE)
+    objects = TagManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'name'],
+                                    name='tag_unique_user_name'),
+        ]
 
     def __str__(self):
         return self.name
+
+
+class RecipeStats(models.Model):
+    """Running totals of a user's recipes, maintained by core.stats."""
+    user = models.OneToOneField(settings.AUTH_USER_MODEL,
+                                on_delete=models.CASCADE, primary_key=True)
+    recipe_count = models.IntegerField(default=0)
+    total_time_minutes = models.BigIntegerField(default=0)
+    total_price = models.DecimalField(max_digits=14, decimal_places=2,
+                                      default=0)
+    min_price = models.DecimalField(max_digits=5, decimal_places=2,
+                                    null=True)
+    max_price = models.DecimalField(max_digits=5, decimal_places=2,
+                                    null=True)
+
+    @property
+    def avg_time_minutes(self):
+        if not self.recipe_count:
+            return None
+        return round(self.total_time_minutes / self.recipe_count, 2)
+
+    @property
+    def avg_price(self):
+        if not self.recipe_count:
+            return None
+        return round(self.total_price / self.recipe_count, 2)
+
+
+class TagStats(models.Model):
+    """How many recipes use each tag, maintained by core.stats."""
+    tag = models.OneToOneField(Tag, on_delete=models.CASCADE,
+                               primary_key=True)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL,
+                             on_delete=models.CASCADE)
+    recipe_count = models.IntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', '-recipe_count'],
+                         name='tagstats_user_count_idx'),
+        ]
@@ -0,0 +1,188 @@
+"""Keyset pagination shared by the API views."""
+import json
+import math
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+def planner_estimate(queryset):
+    """
+    PostgreSQL's row estimate for ``queryset``, or None on other backends:
+    pg_class.reltuples for a whole table, the query plan's rows otherwise.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        if not queryset.query.where:
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class '
+                'WHERE oid = %s::regclass',
+                [connection.ops.quote_name(queryset.model._meta.db_table)])
+            row = cursor.fetchone()
+            # reltuples is -1 until the table is first analyzed.
+            return max(row[0], 0) if row else None
+        sql, params = queryset.order_by().query.sql_with_params()
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+        return plan[0]['Plan']['Plan Rows']
+
+
+def estimate_count(queryset):
+    """
+    (count, estimated): the planner's estimate once it reaches
+    PAGINATION_EXACT_COUNT_LIMIT rows, an exact COUNT(*) below that.
+    """
+    estimate = planner_estimate(queryset)
+    if estimate is not None and estimate >= (
+            settings.PAGINATION_EXACT_COUNT_LIMIT):
+        return estimate, True
+    return queryset.count(), False
+
+
+class KeysetPagination(CursorPagination):
+    """Paginate on an indexed ordering with opaque cursors, never OFFSET."""
+    ordering = '-id'
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+
+    composite = False
+
+    def get_ordering(self, request, queryset, view):
+        """Follow the queryset's own ordering, e.g. by search rank."""
+        ordering = queryset.query.order_by
+        if ordering and all(isinstance(field, str) for field in ordering):
+            return tuple(ordering)
+        return super().get_ordering(request, queryset, view)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        ordering = self.get_ordering(request, queryset, view)
+        if len(ordering) == 1:
+            return super().paginate_queryset(queryset, request, view)
+        return self._paginate_composite(queryset, request, ordering)
+
+    def _paginate_composite(self, queryset, request, ordering):
+        """
+        Keyset on every ordering field, e.g. (rank, id) for search.
+        CursorPagination keys on the first field only and skips ties with
+        OFFSET, which stops advancing once offset_cutoff rows tie. These
+        cursors only go forward, so there is no previous link. The fields
+        must not be nullable.
+        """
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+        self.composite = True
+        self.base_url = request.build_absolute_uri()
+        self.ordering = ordering
+        key = self._decode_key(request)
+        if key is not None:
+            try:
+                queryset = queryset.filter(self._after(ordering, key))
+            except (ValueError, TypeError, ValidationError):
+                # Values that do not fit their ordering field, e.g. 'x' as id.
+                raise NotFound(self.invalid_cursor_message)
+        rows = list(queryset[:self.page_size + 1])
+        page = rows[:self.page_size]
+        self.next_key = None
+        if len(rows) > self.page_size:
+            self.next_key = [
+                _field_value(page[-1], field.lstrip('-'))
+                for field in ordering
+            ]
+        return page
+
+    def _decode_key(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            key = json.loads(urlsafe_b64decode(encoded.encode()))
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(key, list) or len(key) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        if not all(_valid_key_value(value) for value in key):
+            raise NotFound(self.invalid_cursor_message)
+        return key
+
+    def _after(self, ordering, key):
+        """Rows strictly after ``key`` in ``ordering``."""
+        after = Q()
+        for i, field in enumerate(ordering):
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            ties = {
+                previous.lstrip('-'): value
+                for previous, value in zip(ordering[:i], key[:i])
+            }
+            after |= Q(**ties, **{f'{field.lstrip("-")}__{lookup}': key[i]})
+        return after
+
+    def get_next_link(self):
+        if not self.composite:
+            return super().get_next_link()
+        if self.next_key is None:
+            return None
+        encoded = urlsafe_b64encode(
+            json.dumps(self.next_key, default=str).encode()).decode()
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, encoded)
+
+    def get_previous_link(self):
+        if not self.composite:
+            return super().get_previous_link()
+        return None
+
+
+def _valid_key_value(value):
+    """
+    Scalars only, since the ordering fields are not nullable; numbers must
+    be finite and fit a bigint, or the database rejects the query.
+    """
+    if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+        return False
+    if isinstance(value, str):
+        return True
+    return math.isfinite(value) and abs(value) < 2 ** 63
+
+
+def _field_value(row, name):
+    return row[name] if isinstance(row, dict) else getattr(row, name)
+
+
+class NameKeysetPagination(KeysetPagination):
+    ordering = '-name'
+
+
+class CountedKeysetPagination(KeysetPagination):
+    """Keyset pagination that also reports a (possibly estimated) count."""
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.count, self.count_estimated = estimate_count(queryset)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'count': self.count,
+            'count_estimated': self.count_estimated,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema['properties'] = {
+            'count': {'type': 'integer'},
+            'count_estimated': {'type': 'boolean'},
+            **response_schema['properties'],
+        }
+        return response_schema
@@ -0,0 +1,35 @@
+"""JSON parser backed by orjson when it is installed."""
+import codecs
+from decimal import Decimal
+
+from django.conf import settings
+from rest_framework import parsers
+from rest_framework.exceptions import ParseError
+from rest_framework.utils import json
+
+from core.renderers import FastJSONRenderer, orjson
+
+
+class FastJSONParser(parsers.JSONParser):
+    """
+    Parses UTF-8 bodies with orjson. Otherwise it falls back to the stdlib
+    with ``parse_float=Decimal``, so prices never pass through binary floats.
+    orjson yields floats, whose shortest repr round-trips for any price
+    that fits the model's DecimalField.
+    """
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        try:
+            if orjson is not None and codecs.lookup(encoding).name == 'utf-8':
+                return orjson.loads(stream.read())
+            parse_constant = json.strict_constant if self.strict else None
+            return json.load(
+                codecs.getreader(encoding)(stream),
+                parse_constant=parse_constant,
+                parse_float=Decimal
+            )
+        except ValueError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
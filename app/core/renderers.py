@@ -0,0 +1,49 @@
+"""JSON renderer backed by orjson when it is installed."""
+from decimal import Decimal
+
+from rest_framework import renderers
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class JSONEncoder(encoders.JSONEncoder):
+    """DRF's encoder, but Decimals keep every digit as strings."""
+
+    def default(self, obj):
+        if isinstance(obj, Decimal):
+            return str(obj)
+        return super().default(obj)
+
+
+_encoder = JSONEncoder()
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    """
+    Renders compact JSON with orjson, producing the same output as DRF's
+    JSONRenderer. Indented output, ASCII-only output, values orjson rejects
+    and missing orjson all fall back to the stdlib encoder.
+    """
+    encoder_class = JSONEncoder
+    orjson_options = (
+        orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if orjson else 0
+    )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        fast = orjson and not self.ensure_ascii and self.compact
+        if not fast or data is None or indent is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(
+                data, default=_encoder.default, option=self.orjson_options)
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Match JSONRenderer, which escapes these to stay a JavaScript subset.
+        return ret.replace(
+            '\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
@@ -0,0 +1,101 @@
+"""Route reads from safe-method API requests to read replicas."""
+import math
+import random
+import threading
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, connections
+
+
+# Set for the duration of a safe-method request by ReplicaReadMixin.
+replica_reads = ContextVar('replica_reads', default=False)
+
+_lag = {}
+_lag_lock = threading.Lock()
+
+
+def _pin_key(user_id):
+    return f'db-pin:{user_id}'
+
+
+def pin_seconds():
+    """
+    REPLICA_PIN_SECONDS, raised to cover the most a usable replica can be
+    behind: REPLICA_MAX_LAG_SECONDS as of a check up to
+    REPLICA_LAG_CHECK_SECONDS old. Anything shorter breaks read-your-writes.
+    """
+    return max(settings.REPLICA_PIN_SECONDS, math.ceil(
+        settings.REPLICA_MAX_LAG_SECONDS + settings.REPLICA_LAG_CHECK_SECONDS))
+
+
+def pin_to_primary(user_id):
+    """Read this user's data from the primary for pin_seconds()."""
+    cache.set(_pin_key(user_id), True, pin_seconds())
+
+
+def is_pinned(user_id):
+    return cache.get(_pin_key(user_id), False)
+
+
+def replica_lag(alias):
+    """Seconds the replica is behind, checked at most every few seconds."""
+    now = time.monotonic()
+    with _lag_lock:
+        checked, lag = _lag.get(alias, (None, 0.0))
+    if checked is not None and now - checked < settings.REPLICA_LAG_CHECK_SECONDS:
+        return lag
+    connection = connections[alias]
+    try:
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                # The last replay time keeps ageing on an idle primary, so
+                # only trust it while received WAL is still being replayed.
+                cursor.execute(
+                    'SELECT CASE WHEN pg_last_wal_receive_lsn() = '
+                    'pg_last_wal_replay_lsn() THEN 0 ELSE COALESCE('
+                    'EXTRACT(EPOCH FROM now() - '
+                    'pg_last_xact_replay_timestamp()), 0) END')
+                lag = float(cursor.fetchone()[0])
+        else:
+            lag = 0.0
+    except DatabaseError:
+        lag = float('inf')
+    with _lag_lock:
+        _lag[alias] = (now, lag)
+    return lag
+
+
+def choose_replica():
+    """A random replica within REPLICA_MAX_LAG_SECONDS, or None."""
+    healthy = [
+        alias for alias in settings.DATABASE_REPLICAS
+        if replica_lag(alias) <= settings.REPLICA_MAX_LAG_SECONDS
+    ]
+    return random.choice(healthy) if healthy else None
+
+
+class ReplicaRouter:
+    """
+    Send reads to a replica while ``replica_reads`` is set, falling back
+    to the primary when every replica lags. Writes, and reads outside
+    replica-enabled requests, use the default database.
+    """
+
+    def db_for_read(self, model, **hints):
+        if not replica_reads.get():
+            return None
+        return choose_replica()
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
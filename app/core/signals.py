@@ -0,0 +1,136 @@
+"""Signal handlers keeping core caches consistent with the database."""
+from collections import Counter
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models.signals import (
+    m2m_changed, post_delete, post_save, pre_delete, pre_save)
+from django.dispatch import Signal, receiver
+from rest_framework.authtoken.models import Token
+
+from core import stats
+from core.authentication import token_cache
+from core.models import Recipe, RecipeStats, Tag
+from core.versioning import bump_version_on_commit
+
+
+# Sent with a ``user`` argument after bulk writes that bypass model signals.
+recipes_bulk_changed = Signal()
+
+
+@receiver(post_delete, sender=Token)
+def evict_deleted_token(sender, instance, **kwargs):
+    token_cache.delete(instance.key)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def evict_user_tokens(sender, instance, **kwargs):
+    """Drop cached tokens so deactivation and profile edits apply at once."""
+    token_cache.delete(
+        *Token.objects.filter(user=instance).values_list('key', flat=True))
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def create_user_stats(sender, instance, created, raw=False, **kwargs):
+    """Start every account with a stats row so writes only ever update it."""
+    if created and not raw:
+        RecipeStats.objects.create(user=instance)
+
+
+@receiver(post_save, sender=Recipe)
+@receiver(post_delete, sender=Recipe)
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def bump_owner_version(sender, instance, using=None, **kwargs):
+    bump_version_on_commit(instance.user_id, using)
+
+
+@receiver(m2m_changed, sender=Recipe.tags.through)
+def bump_version_on_tagging(sender, instance, action, using=None,
+                            **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        bump_version_on_commit(instance.user_id, using)
+
+
+@receiver(recipes_bulk_changed)
+def bump_version_on_bulk_change(sender, user, **kwargs):
+    bump_version_on_commit(user.id)
+
+
+def _skip_stats(origin=None):
+    """True while suspended, or when the owner's rows go with the user."""
+    if stats.updates_suspended():
+        return True
+    user_model = get_user_model()
+    return isinstance(origin, user_model) or (
+        getattr(origin, 'model', None) is user_model)
+
+
+@receiver(pre_save, sender=Recipe)
+def remember_recipe_totals(sender, instance, raw=False, update_fields=None,
+                           **kwargs):
+    if raw or instance._state.adding or _skip_stats():
+        return
+    if update_fields is not None and not (
+            {'time_minutes', 'price'} & set(update_fields)):
+        return
+    instance._stats_totals = Recipe.objects.filter(
+        pk=instance.pk).values_list('time_minutes', 'price').first()
+
+
+@receiver(post_save, sender=Recipe)
+def update_recipe_stats(sender, instance, created, raw=False, **kwargs):
+    if raw or _skip_stats():
+        return
+    if created:
+        stats.recipe_added(instance)
+        return
+    old = instance.__dict__.pop('_stats_totals', None)
+    if old is not None:
+        stats.recipe_changed(instance, old)
+
+
+@receiver(pre_delete, sender=Recipe)
+def release_recipe_tags(sender, instance, origin=None, **kwargs):
+    """Count down the tags now, the links are gone by post_delete."""
+    if _skip_stats(origin):
+        return
+    stats.adjust_tag_usage(instance.user_id, {
+        tag_id: -1 for tag_id in Recipe.tags.through.objects.filter(
+            recipe_id=instance.pk).values_list('tag_id', flat=True)
+    })
+
+
+@receiver(post_delete, sender=Recipe)
+def remove_recipe_stats(sender, instance, origin=None, **kwargs):
+    if not _skip_stats(origin):
+        stats.recipe_removed(instance)
+
+
+@receiver(m2m_changed, sender=Recipe.tags.through)
+def count_tag_usage(sender, instance, action, reverse, pk_set, **kwargs):
+    if _skip_stats():
+        return
+    if action == 'post_add':
+        if reverse:
+            stats.adjust_tag_usage(
+                instance.user_id, {instance.pk: len(pk_set)})
+        else:
+            stats.adjust_tag_usage(
+                instance.user_id, {tag_id: 1 for tag_id in pk_set})
+    elif action in ('pre_remove', 'pre_clear'):
+        # Removing ids that were never linked must not count down.
+        links = sender.objects.filter(
+            **{'tag_id' if reverse else 'recipe_id': instance.pk})
+        if action == 'pre_remove':
+            links = links.filter(
+                **{'recipe_id__in' if reverse else 'tag_id__in': pk_set})
+        stats.adjust_tag_usage(instance.user_id, {
+            tag_id: -count for tag_id, count in Counter(
+                links.values_list('tag_id', flat=True)).items()
+        })
+
+
+@receiver(recipes_bulk_changed)
+def rebuild_stats_on_bulk_change(sender, user, **kwargs):
+    stats.rebuild_user(user.id)
@@ -0,0 +1,178 @@
+"""Incrementally maintained per-user recipe and tag statistics."""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Case, Count, F, Max, Min, Q, Sum, Value, When
+from django.db.models.functions import Coalesce
+
+from core.models import Recipe, RecipeStats, Tag, TagStats
+
+
+# Deltas and rebuilds read and write on the primary only; a rebuild that
+# aggregated a lagging replica would write stale totals.
+PRIMARY = 'default'
+
+_suspended = ContextVar('stats_updates_suspended', default=False)
+
+
+@contextmanager
+def suspend_updates():
+    """
+    Skip the per-row updates inside the block; the caller rebuilds the
+    affected users afterwards, e.g. by sending recipes_bulk_changed.
+    """
+    token = _suspended.set(True)
+    try:
+        yield
+    finally:
+        _suspended.reset(token)
+
+
+def updates_suspended():
+    return _suspended.get()
+
+
+def _lock(user_id):
+    """
+    Lock the user's RecipeStats row. Every delta and rebuild takes it
+    first, so a rebuild's aggregates cannot interleave with a delta.
+    """
+    return list(RecipeStats.objects.using(PRIMARY).select_for_update().filter(
+        user_id=user_id).values_list('pk', flat=True))
+
+
+def _refresh_price_range(user_id):
+    """Recompute min/max price, served by the (user, price) index."""
+    prices = Recipe.objects.using(PRIMARY).filter(user_id=user_id).aggregate(
+        min_price=Min('price'), max_price=Max('price'))
+    RecipeStats.objects.using(PRIMARY).filter(user_id=user_id).update(
+        **prices)
+
+
+def _totals(recipe):
+    return int(recipe.time_minutes), Decimal(recipe.price)
+
+
+@transaction.atomic(using=PRIMARY)
+def recipe_added(recipe):
+    if not _lock(recipe.user_id):
+        rebuild_user(recipe.user_id)
+        return
+    time_minutes, price = _totals(recipe)
+    RecipeStats.objects.using(PRIMARY).filter(user_id=recipe.user_id).update(
+        recipe_count=F('recipe_count') + 1,
+        total_time_minutes=F('total_time_minutes') + time_minutes,
+        total_price=F('total_price') + price,
+        min_price=Case(
+            When(Q(min_price__isnull=True) | Q(min_price__gt=price),
+                 then=Value(price)),
+            default=F('min_price')),
+        max_price=Case(
+            When(Q(max_price__isnull=True) | Q(max_price__lt=price),
+                 then=Value(price)),
+            default=F('max_price')),
+    )
+
+
+@transaction.atomic(using=PRIMARY)
+def recipe_changed(recipe, old):
+    """Apply the difference between ``old`` (time, price) and ``recipe``."""
+    old_time, old_price = old
+    time_minutes, price = _totals(recipe)
+    if (old_time, old_price) == (time_minutes, price):
+        return
+    if not _lock(recipe.user_id):
+        rebuild_user(recipe.user_id)
+        return
+    RecipeStats.objects.using(PRIMARY).filter(user_id=recipe.user_id).update(
+        total_time_minutes=F('total_time_minutes') + time_minutes - old_time,
+        total_price=F('total_price') + price - old_price,
+    )
+    if old_price != price:
+        _refresh_price_range(recipe.user_id)
+
+
+@transaction.atomic(using=PRIMARY)
+def recipe_removed(recipe):
+    if not _lock(recipe.user_id):
+        return
+    time_minutes, price = _totals(recipe)
+    stats = RecipeStats.objects.using(PRIMARY).filter(user_id=recipe.user_id)
+    stats.update(
+        recipe_count=F('recipe_count') - 1,
+        total_time_minutes=F('total_time_minutes') - time_minutes,
+        total_price=F('total_price') - price,
+    )
+    # Only the bounds can be stale, and only if this recipe set one.
+    if stats.filter(Q(min_price=price) | Q(max_price=price)).exists():
+        _refresh_price_range(recipe.user_id)
+
+
+@transaction.atomic(using=PRIMARY)
+def adjust_tag_usage(user_id, deltas):
+    """Add ``deltas[tag_id]`` to the recipe count of each of a user's tags."""
+    if not any(deltas.values()):
+        return
+    _lock(user_id)
+    tag_stats = TagStats.objects.using(PRIMARY)
+    by_delta = {}
+    for tag_id, delta in deltas.items():
+        if delta:
+            by_delta.setdefault(delta, []).append(tag_id)
+    for delta, tag_ids in by_delta.items():
+        tag_stats.filter(tag_id__in=tag_ids).update(
+            recipe_count=F('recipe_count') + delta)
+        if delta < 0:
+            continue
+        # Tags bulk-created without signals have no row yet.
+        existing = set(tag_stats.filter(
+            tag_id__in=tag_ids).values_list('tag_id', flat=True))
+        tag_stats.bulk_create([
+            TagStats(tag_id=tag_id, user_id=user_id, recipe_count=delta)
+            for tag_id in set(tag_ids) - existing
+        ], ignore_conflicts=True)
+
+
+@transaction.atomic(using=PRIMARY)
+def rebuild_user(user_id):
+    """Recompute one user's statistics from scratch."""
+    stats, _ = RecipeStats.objects.using(PRIMARY).select_for_update(
+    ).get_or_create(user_id=user_id)
+    totals = Recipe.objects.using(PRIMARY).filter(user_id=user_id).aggregate(
+        recipe_count=Count('id'),
+        total_time_minutes=Coalesce(Sum('time_minutes'), 0),
+        total_price=Sum('price'),
+        min_price=Min('price'),
+        max_price=Max('price'),
+    )
+    totals['total_price'] = totals['total_price'] or 0
+    for field, value in totals.items():
+        setattr(stats, field, value)
+    stats.save(using=PRIMARY)
+    tag_stats = TagStats.objects.using(PRIMARY)
+    tag_stats.filter(user_id=user_id).delete()
+    tag_stats.bulk_create([
+        TagStats(tag_id=tag['id'], user_id=user_id,
+                 recipe_count=tag['recipe_count'])
+        for tag in Tag.objects.using(PRIMARY).filter(user_id=user_id).annotate(
+            recipe_count=Count('recipe')).values('id', 'recipe_count')
+    ], ignore_conflicts=True)
+    return stats
+
+
+def get_stats(user):
+    """The user's statistics row, built on the primary on first use."""
+    try:
+        return RecipeStats.objects.get(user=user)
+    except RecipeStats.DoesNotExist:
+        return rebuild_user(user.id)
+
+
+def top_tags(user, limit):
+    """The user's most used tags, read from the (user, count) index."""
+    return TagStats.objects.filter(
+        user=user, recipe_count__gt=0
+    ).select_related('tag').order_by('-recipe_count', 'tag_id')[:limit]
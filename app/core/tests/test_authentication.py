@@ -0,0 +1,95 @@
+"""Tests for the cached token authentication"""
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from core.authentication import TokenCache, token_cache
+
+
+ME_URL = reverse('user:me')
+
+
+class CachedTokenAuthenticationTests(TestCase):
+    def setUp(self):
+        token_cache.clear()
+        self.user = get_user_model().objects.create_user(
+            'test@example.com', 'testpass123', name='test')
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def test_repeat_requests_skip_database(self):
+        with self.assertNumQueries(1):
+            self.client.get(ME_URL)
+        with self.assertNumQueries(0):
+            res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(token_cache.stats()['hits'], 1)
+        self.assertEqual(token_cache.stats()['misses'], 1)
+
+    def test_deleted_token_rejected(self):
+        self.client.get(ME_URL)
+        self.token.delete()
+
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deactivated_user_rejected(self):
+        self.client.get(ME_URL)
+        self.user.is_active = False
+        self.user.save()
+
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_profile_update_visible_on_next_request(self):
+        self.client.get(ME_URL)
+        self.client.patch(ME_URL, {'name': 'renamed'})
+
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.data['name'], 'renamed')
+
+
+class TokenCacheTests(TestCase):
+    def test_least_recently_used_evicted(self):
+        cache = TokenCache(max_size=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+
+    def test_expired_entries_missed(self):
+        cache = TokenCache(ttl=0)
+        cache.set('a', 1)
+
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.stats()['misses'], 1)
+
+    def test_shared_backend_consulted(self):
+        cache = TokenCache(backend='default')
+        cache.set('a', 1)
+        other_process = TokenCache(backend='default')
+
+        self.assertEqual(other_process.get('a'), 1)
+        cache.delete('a')
+        self.assertIsNone(TokenCache(backend='default').get('a'))
+
+    def test_shared_backend_revocation_reaches_warm_instances(self):
+        cache = TokenCache(backend='default')
+        other_process = TokenCache(backend='default')
+        cache.set('a', 1)
+        self.assertEqual(other_process.get('a'), 1)
+
+        cache.delete('a')
+
+        self.assertIsNone(other_process.get('a'))
@@ -1,31 +1,260 @@
 """TEST FOR COMMANDS FOR DJANGO"""
 
+import json
+import os
+import tempfile
+from decimal import Decimal
+from io import StringIO
 from unittest.mock import patch
 from psycopg2 import OperationalError as Psycopg2Error
+from django.contrib.auth import get_user_model
 from django.core.management import call_command
+from django.core.management.base import CommandError
 from django.db.utils import OperationalError
-from django.test import SimpleTestCase
+from django.test import SimpleTestCase, TestCase
 
+from core.models import Recipe, RecipeStats, Tag
 
-@patch("core.management.commands.wait_for_db.Command.check")
+
+@patch("core.management.commands.wait_for_db.Command.probe_database")
 class CommandTests(SimpleTestCase):
     """TEST COMMANDS"""
 
-    def test_wait_for_db_ready(self, patched_check):
+    def test_wait_for_db_ready(self, patched_probe):
         """test waiting for database if database is ready"""
-        patched_check.return_value = True
+        patched_probe.return_value = None
 
-        call_command('wait_for_db')
+        call_command('wait_for_db', stdout=StringIO())
 
-        patched_check.assert_called_once_with(databases=['default'])
+        patched_probe.assert_any_call('default')
 
     @patch('time.sleep')
-    def test_wait_for_db_delay(self, patched_sleep, patched_check):
+    def test_wait_for_db_delay(self, patched_sleep, patched_probe):
         """test waiting for database if database is NOT ready"""
-        patched_check.side_effect = [Psycopg2Error] * 2 + \
-            [OperationalError] * 3 + [True]
+        failures = [Psycopg2Error] * 2 + [OperationalError] * 3
+
+        def probe(alias):
+            if alias == 'default' and failures:
+                raise failures.pop(0)
+
+        patched_probe.side_effect = probe
+
+        call_command('wait_for_db', initial_delay=0.1, max_delay=0.4,
+                     stdout=StringIO())
+
+        probed = [args for args, _ in patched_probe.call_args_list]
+        self.assertEqual(probed.count(('default',)), 6)
+        expected = [0.1, 0.2, 0.4, 0.4, 0.4]
+        for call, delay in zip(patched_sleep.call_args_list, expected):
+            self.assertGreaterEqual(call.args[0], delay / 2)
+            self.assertLessEqual(call.args[0], delay)
+
+    def test_wait_for_db_timeout(self, patched_probe):
+        """test giving up once the timeout is spent"""
+        patched_probe.side_effect = OperationalError
+
+        with self.assertRaises(CommandError):
+            call_command('wait_for_db', timeout=0, stdout=StringIO())
+
+    @patch('core.management.commands.wait_for_db.Command.probe_cache')
+    @patch('time.sleep')
+    def test_wait_for_caches(self, patched_sleep, patched_cache,
+                             patched_probe):
+        """test caches are waited for alongside the database"""
+        patched_cache.side_effect = [ConnectionError, None]
+        out = StringIO()
+
+        call_command('wait_for_db', stdout=out)
+
+        self.assertEqual(patched_cache.call_count, 2)
+        self.assertIn('cache default ready', out.getvalue())
+        self.assertIn('database default ready', out.getvalue())
+
+
+class ImportRecipesCommandTests(TestCase):
+    """TEST IMPORT_RECIPES COMMAND"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            'test@example.com', 'testpass123')
+
+    def write_dump(self, content, suffix):
+        dump = tempfile.NamedTemporaryFile(
+            'w', suffix=suffix, delete=False)
+        dump.write(content)
+        dump.close()
+        self.addCleanup(os.remove, dump.name)
+        return dump.name
+
+    def ndjson_dump(self, count):
+        return self.write_dump(''.join(json.dumps({
+            'title': f'recipe {i}',
+            'time_minutes': i,
+            'price': '2.50',
+            'tags': ['dinner', f'tag{i % 2}'],
+        }) + '\n' for i in range(count)), '.ndjson')
+
+    def test_import_ndjson(self):
+        out = StringIO()
+        call_command('import_recipes', self.ndjson_dump(5),
+                     user=self.user.email, batch_size=2, stdout=out)
+
+        recipes = Recipe.objects.filter(user=self.user).order_by('id')
+        self.assertEqual(recipes.count(), 5)
+        self.assertEqual(
+            sorted(Tag.objects.values_list('name', flat=True)),
+            ['dinner', 'tag0', 'tag1'])
+        self.assertEqual(
+            sorted(recipes[1].tags.values_list('name', flat=True)),
+            ['dinner', 'tag1'])
+        self.assertIn('rows/s', out.getvalue())
+        self.assertIn('resume with --offset 4', out.getvalue())
+
+    def test_import_csv_with_user_column(self):
+        other = get_user_model().objects.create_user(
+            'other@example.com', 'testpass123')
+        path = self.write_dump(
+            'user,title,description,time_minutes,price,link,tags\n'
+            'test@example.com,curry,,30,5.50,,thai|dinner\n'
+            'other@example.com,toast,crispy,5,1.00,,\n', '.csv')
+
+        call_command('import_recipes', path, stdout=StringIO())
+
+        curry = Recipe.objects.get(user=self.user)
+        toast = Recipe.objects.get(user=other)
+        self.assertEqual(curry.price, Decimal('5.50'))
+        self.assertEqual(curry.tags.count(), 2)
+        self.assertEqual(toast.description, 'crispy')
+
+    def test_import_resumes_from_offset(self):
+        call_command('import_recipes', self.ndjson_dump(5),
+                     user=self.user.email, offset=3, stdout=StringIO())
+
+        self.assertEqual(
+            sorted(Recipe.objects.values_list('title', flat=True)),
+            ['recipe 3', 'recipe 4'])
+
+    def test_import_reports_bad_row(self):
+        path = self.write_dump(
+            json.dumps({'title': 'x', 'time_minutes': 'soon',
+                        'price': '1.00'}) + '\n', '.ndjson')
+
+        with self.assertRaisesMessage(CommandError, 'Row 1'):
+            call_command('import_recipes', path, user=self.user.email,
+                         stdout=StringIO())
+
+    def test_import_rejects_values_beyond_model_limits(self):
+        rows = [
+            ({'price': '1000.00'}, 'price'),
+            ({'price': 'NaN'}, 'price'),
+            ({'title': 'x' * 256}, 'title'),
+            ({'tags': ['t' * 256]}, 'tags'),
+        ]
+        for change, message in rows:
+            with self.subTest(change=change):
+                row = {'title': 'x', 'time_minutes': 5, 'price': '1.00',
+                       **change}
+                path = self.write_dump(json.dumps(row) + '\n', '.ndjson')
+
+                with self.assertRaisesMessage(CommandError, 'Row 1') as cm:
+                    call_command('import_recipes', path,
+                                 user=self.user.email, stdout=StringIO())
+                self.assertIn(message, str(cm.exception))
+        self.assertFalse(Recipe.objects.exists())
+
+
+class RebuildStatsCommandTests(TestCase):
+    def test_rebuild_after_unsignalled_writes(self):
+        user = get_user_model().objects.create_user(
+            'test@example.com', 'testpass123')
+        Recipe.objects.bulk_create([
+            Recipe(user=user, title=f'r{i}', time_minutes=i,
+                   price=Decimal('2.00'))
+            for i in range(3)
+        ])
+
+        call_command('rebuild_stats', emails=[user.email], stdout=StringIO())
+
+        summary = RecipeStats.objects.get(user=user)
+        self.assertEqual(summary.recipe_count, 3)
+        self.assertEqual(summary.total_time_minutes, 3)
+        self.assertEqual(summary.min_price, Decimal('2.00'))
+
+    def test_rebuild_unknown_user(self):
+        with self.assertRaisesMessage(CommandError, 'nobody@example.com'):
+            call_command('rebuild_stats', emails=['nobody@example.com'],
+                         stdout=StringIO())
+
+
+class BenchmarkCommandTests(TestCase):
+    def test_reports_every_scenario(self):
+        existing = get_user_model().objects.create_user(
+            'bench-0@example.com', 'testpass123')
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'bench.json')
+            call_command(
+                'benchmark', users=2, recipes=3, tags=2, requests=2,
+                concurrency=1, json_path=path, stdout=StringIO())
+            with open(path) as f:
+                results = json.load(f)
+
+        self.assertEqual(results['parameters']['users'], 2)
+        self.assertEqual(len(results['scenarios']), 8)
+        for name, result in results['scenarios'].items():
+            self.assertEqual(result['requests'], 2, name)
+            self.assertEqual(result['errors'], 0, name)
+            self.assertLessEqual(result['p50_ms'], result['p99_ms'])
+        self.assertQuerysetEqual(
+            get_user_model().objects.all(), [existing])
+
+    def test_json_to_stdout_reports_to_stderr(self):
+        out, err = StringIO(), StringIO()
+        call_command(
+            'benchmark', users=1, recipes=1, tags=1, requests=1,
+            concurrency=1, scenario=['recipe-list'], json_path='-',
+            stdout=out, stderr=err)
+
+        results = json.loads(out.getvalue())
+        self.assertEqual(list(results['scenarios']), ['recipe-list'])
+        self.assertIn('recipe-list', err.getvalue())
+
+    def test_unknown_scenario_rejected(self):
+        with self.assertRaisesMessage(CommandError, 'invalid choice'):
+            call_command('benchmark', '--scenario', 'nope',
+                         stdout=StringIO())
+
+    def test_serving_benchmark(self):
+        for server in ('wsgi', 'asgi'):
+            with self.subTest(server=server):
+                out = StringIO()
+                call_command(
+                    'bench_serving', server=server, clients=1, requests=2,
+                    users=1, recipes=2, client_delay=0, json_path='-',
+                    stdout=out, stderr=StringIO())
+                result = json.loads(out.getvalue())
+
+                self.assertEqual(result['requests'], 2)
+                self.assertEqual(result['errors'], 0)
+
+    def test_login_benchmark(self):
+        out = StringIO()
+        call_command('bench_logins', users=1, logins=2, concurrency=1,
+                     profile=['test', 'memory-hard'], json_path='-',
+                     stdout=out, stderr=StringIO())
+        results = json.loads(out.getvalue())
+
+        self.assertEqual(set(results), {'test', 'memory-hard'})
+        for result in results.values():
+            self.assertEqual(result['requests'], 2)
+            self.assertEqual(result['errors'], 0)
 
-        call_command('wait_for_db')
+    def test_throttle_benchmark(self):
+        out = StringIO()
+        call_command('bench_throttle', iterations=10, keys=3, json_path='-',
+                     stdout=out, stderr=StringIO())
+        results = json.loads(out.getvalue())
 
-        self.assertEqual(patched_check.call_count, 6)
-        patched_check.assert_called_with(databases=['default'])
+        self.assertIn('local', results)
+        for result in results.values():
+            self.assertGreater(result['store_us'], 0)
+            self.assertGreater(result['throttle_us'], 0)
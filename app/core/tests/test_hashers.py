@@ -0,0 +1,75 @@
+"""Tests for the hasher profiles and hash upgrades on login"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import identify_hasher, make_password
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+
+TOKEN_URL = reverse('user:token')
+TEST_PROFILE = settings.PASSWORD_HASHER_PROFILES['test']
+
+
+@override_settings(
+    PASSWORD_HASHER_PROFILE='test',
+    PASSWORD_HASHER_COST=TEST_PROFILE['COST'],
+    PASSWORD_HASHERS=list(dict.fromkeys(
+        TEST_PROFILE['HASHERS'] + settings.PASSWORD_HASHERS)))
+class HasherProfileTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            'test@example.com', 'test-123')
+
+    def login(self, password='test-123'):
+        return self.client.post(
+            TOKEN_URL, {'email': 'test@example.com', 'password': password})
+
+    def test_test_profile_hashes_cheaply(self):
+        self.assertTrue(self.user.password.startswith('pbkdf2_sha256$1000$'))
+
+    def test_old_algorithm_upgraded_on_login(self):
+        self.user.password = make_password('test-123', hasher='pbkdf2_sha1')
+        self.user.save()
+
+        res = self.login()
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('pbkdf2_sha256$1000$'))
+
+    def test_cost_change_upgraded_on_login(self):
+        with override_settings(PASSWORD_HASHER_COST={'PBKDF2_ITERATIONS': 500}):
+            self.user.set_password('test-123')
+            self.user.save()
+        self.assertTrue(self.user.password.startswith('pbkdf2_sha256$500$'))
+
+        self.login()
+
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('pbkdf2_sha256$1000$'))
+
+    def test_failed_login_keeps_hash(self):
+        self.user.password = make_password('test-123', hasher='pbkdf2_sha1')
+        self.user.save()
+        old_hash = self.user.password
+
+        res = self.login('wrong-password')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.password, old_hash)
+
+    def test_memory_hard_profile(self):
+        profile = settings.PASSWORD_HASHER_PROFILES['memory-hard']
+        with override_settings(
+                PASSWORD_HASHERS=profile['HASHERS'] + settings.PASSWORD_HASHERS,
+                PASSWORD_HASHER_COST=profile['COST']):
+            self.login()
+            self.user.refresh_from_db()
+
+            self.assertEqual(identify_hasher(self.user.password).algorithm,
+                             'scrypt')
+            self.assertEqual(self.login().status_code, status.HTTP_200_OK)
@@ -0,0 +1,128 @@
+"""Tests for the password hashing executor"""
+import threading
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import check_password
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core import hashing
+from core.hashing import HashingBusy, HashingExecutor
+
+
+TOKEN_URL = reverse('user:token')
+CREATE_USER_URL = reverse('user:create')
+
+
+class HashingExecutorTests(SimpleTestCase):
+    def test_hashes_on_pool(self):
+        executor = HashingExecutor(workers=2)
+        self.addCleanup(executor.shutdown)
+
+        encoded = executor.make_password('secret123')
+
+        self.assertTrue(check_password('secret123', encoded))
+        self.assertTrue(executor.check_password('secret123', encoded))
+        self.assertFalse(executor.check_password('wrong', encoded))
+        self.assertEqual(executor.stats()['hashes'], 3)
+
+    def test_rejects_when_queue_full(self):
+        executor = HashingExecutor(workers=1, max_queue=0)
+        self.addCleanup(executor.shutdown)
+        started, release = threading.Event(), threading.Event()
+
+        def block():
+            started.set()
+            release.wait(5)
+
+        thread = threading.Thread(target=executor.run, args=(block,))
+        thread.start()
+        started.wait(5)
+        try:
+            with self.assertRaises(HashingBusy) as cm:
+                executor.make_password('secret123')
+        finally:
+            release.set()
+            thread.join()
+
+        self.assertEqual(cm.exception.status_code, 429)
+        self.assertEqual(executor.stats()['rejected'], 1)
+        self.assertTrue(executor.make_password('secret123'))
+
+    def test_timeout_is_busy_and_keeps_slot(self):
+        executor = HashingExecutor(workers=1, max_queue=0, timeout=0.05)
+        self.addCleanup(executor.shutdown)
+        release = threading.Event()
+
+        with self.assertRaises(HashingBusy):
+            executor.run(release.wait, 5)
+        # The timed-out hash is still running and still holds the slot.
+        with self.assertRaises(HashingBusy):
+            executor.run(len, 'x')
+        release.set()
+        executor._pool.submit(lambda: None).result(5)
+
+        self.assertEqual(executor.run(len, 'x'), 1)
+        self.assertEqual(executor.stats()['timeouts'], 1)
+        self.assertEqual(executor.stats()['rejected'], 1)
+
+    def test_hash_time_excludes_queue_wait(self):
+        executor = HashingExecutor(workers=1, max_queue=1)
+        self.addCleanup(executor.shutdown)
+        started, release = threading.Event(), threading.Event()
+
+        def block():
+            started.set()
+            release.wait(5)
+
+        thread = threading.Thread(target=executor.run, args=(block,))
+        thread.start()
+        started.wait(5)
+        queued = threading.Thread(target=executor.run, args=(len, 'x'))
+        queued.start()
+        threading.Timer(0.2, release.set).start()
+        thread.join()
+        queued.join()
+
+        stats = executor.stats()
+        self.assertEqual(stats['hashes'], 2)
+        # Only the blocking call took ~200ms; the queued one waited instead.
+        self.assertLess(stats['hash_ms_total'] - stats['hash_ms_max'], 50)
+
+
+class HashingBackpressureAPITests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        get_user_model().objects.create_user('test@example.com', 'test-123')
+
+    def test_login_rejected_when_busy(self):
+        with patch.object(hashing.executor, 'run',
+                          side_effect=HashingBusy(wait=1)):
+            res = self.client.post(TOKEN_URL, {
+                'email': 'test@example.com', 'password': 'test-123'})
+
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(res['Retry-After'], '1')
+
+    def test_create_rejected_when_busy(self):
+        with patch.object(hashing.executor, 'run',
+                          side_effect=HashingBusy(wait=1)):
+            res = self.client.post(CREATE_USER_URL, {
+                'email': 'new@example.com', 'password': 'test-123',
+                'name': 'new'})
+
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertFalse(get_user_model().objects.filter(
+            email='new@example.com').exists())
+
+    def test_login_uses_executor(self):
+        before = hashing.executor.stats()['hashes']
+
+        res = self.client.post(TOKEN_URL, {
+            'email': 'test@example.com', 'password': 'test-123'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(hashing.executor.stats()['hashes'], before + 1)
@@ -0,0 +1,105 @@
+"""Tests for the profiling middleware and metrics endpoint"""
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import (
+    AsyncClient, RequestFactory, TestCase, override_settings)
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from core.metrics import registry
+from core.middleware import ProfilingMiddleware
+from core.models import Tag
+
+
+TAGS_URL = reverse('recipe:tag-list')
+METRICS_URL = reverse('metrics')
+
+PROFILE_ALL = {'SAMPLE_RATE': 1.0, 'N_PLUS_ONE_THRESHOLD': 3}
+PROFILE_NONE = {'SAMPLE_RATE': 0.0, 'N_PLUS_ONE_THRESHOLD': 3}
+
+
+@override_settings(PROFILING=PROFILE_ALL)
+class ProfilingMiddlewareTests(TestCase):
+    def setUp(self):
+        registry.reset()
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            'test@example.com', 'testpass123')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_server_timing_header(self):
+        res = self.client.get(TAGS_URL)
+
+        timing = res['Server-Timing']
+        for metric in ('total;dur=', 'db;dur=', 'render;dur=', 'app;dur='):
+            self.assertIn(metric, timing)
+        stats = registry.snapshot()['endpoints']['GET recipe:tag-list']
+        self.assertEqual(stats['requests'], 1)
+        self.assertGreater(stats['queries'], 0)
+        self.assertEqual(stats['bytes'], len(res.content))
+
+    @override_settings(PROFILING=PROFILE_NONE)
+    def test_unsampled_request_not_profiled(self):
+        res = self.client.get(TAGS_URL)
+
+        self.assertNotIn('Server-Timing', res)
+        self.assertEqual(registry.snapshot()['endpoints'], {})
+
+    def test_repeated_sql_flagged(self):
+        tags = [Tag.objects.create(user=self.user, name=f't{i}')
+                for i in range(3)]
+
+        def view(request):
+            for tag in tags:
+                Tag.objects.get(id=tag.id)
+            return HttpResponse('ok')
+
+        middleware = ProfilingMiddleware(view)
+        with self.assertLogs('core.middleware', 'WARNING'):
+            res = middleware(RequestFactory().get('/'))
+
+        self.assertIn('desc="3 queries"', res['Server-Timing'])
+        stats = registry.snapshot()['endpoints']['GET unresolved']
+        self.assertEqual(stats['n_plus_one'], 1)
+        self.assertIn('core_tag', stats['last_n_plus_one_sql'])
+
+    async def test_queries_counted_under_asgi(self):
+        token = await Token.objects.acreate(user=self.user)
+        await Tag.objects.acreate(user=self.user, name='thai')
+
+        res = await AsyncClient().get(
+            TAGS_URL, headers={'Authorization': f'Token {token.key}'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotIn('desc="0 queries"', res['Server-Timing'])
+        stats = registry.snapshot()['endpoints']['GET recipe:tag-list']
+        self.assertGreater(stats['queries'], 0)
+
+
+class MetricsViewTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_requires_staff(self):
+        user = get_user_model().objects.create_user(
+            'test@example.com', 'testpass123')
+        self.client.force_authenticate(user)
+
+        res = self.client.get(METRICS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_staff_sees_metrics(self):
+        user = get_user_model().objects.create_superuser(
+            'admin@example.com', 'testpass123')
+        self.client.force_authenticate(user)
+
+        res = self.client.get(METRICS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn('endpoints', res.data)
+        self.assertIn('hits', res.data['token_auth_cache'])
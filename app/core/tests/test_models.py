@@ -56,3 +56,14 @@ class ModelTests(TestCase):
         user = create_user()
         tag = models.Tag.objects.create(user=user, name='tag1')
         self.assertEqual(str(tag), tag.name)
+
+    def test_get_or_create_many_tags(self):
+        user = create_user()
+        existing = models.Tag.objects.create(user=user, name='tag1')
+
+        tags = models.Tag.objects.get_or_create_many(
+            user, ['tag1', 'tag2', 'tag1'])
+
+        self.assertEqual([tag.name for tag in tags], ['tag1', 'tag2'])
+        self.assertEqual(tags[0], existing)
+        self.assertEqual(models.Tag.objects.filter(user=user).count(), 2)
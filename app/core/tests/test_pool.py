@@ -0,0 +1,150 @@
+"""Tests for the connection pool"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.test import SimpleTestCase
+
+from core.db.backends.postgresql_pool.pools import (
+    close_pools, get_pool, pool_key)
+from core.db.pool import ConnectionPool, PoolTimeout
+
+
+class DummyConnection:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class ConnectionPoolTests(SimpleTestCase):
+    def setUp(self):
+        self.opened = []
+        self.lock = threading.Lock()
+
+    def factory(self):
+        connection = DummyConnection()
+        with self.lock:
+            self.opened.append(connection)
+        return connection
+
+    def test_connection_count_bounded_under_load(self):
+        pool = ConnectionPool(self.factory, max_size=3, timeout=5)
+
+        def work(_):
+            connection = pool.acquire()
+            time.sleep(0.005)
+            pool.release(connection)
+
+        with ThreadPoolExecutor(20) as executor:
+            list(executor.map(work, range(200)))
+
+        stats = pool.stats()
+        self.assertLessEqual(len(self.opened), 3)
+        self.assertEqual(stats['acquired'], 200)
+        self.assertLessEqual(stats['max_in_use'], 3)
+        self.assertGreater(stats['waits'], 0)
+        self.assertEqual(stats['in_use'], 0)
+
+    def test_connections_reused(self):
+        pool = ConnectionPool(self.factory, max_size=2)
+        connection = pool.acquire()
+        pool.release(connection)
+
+        self.assertIs(pool.acquire(), connection)
+        self.assertEqual(len(self.opened), 1)
+
+    def test_timeout_when_exhausted(self):
+        pool = ConnectionPool(self.factory, max_size=1, timeout=0.01)
+        pool.acquire()
+
+        with self.assertRaises(PoolTimeout):
+            pool.acquire()
+        self.assertEqual(pool.stats()['timeouts'], 1)
+
+    def test_failed_check_replaces_connection(self):
+        pool = ConnectionPool(
+            self.factory, max_size=1,
+            check=lambda connection: not connection.closed)
+        broken = pool.acquire()
+        pool.release(broken)
+        broken.closed = True
+
+        connection = pool.acquire()
+
+        self.assertIsNot(connection, broken)
+        self.assertEqual(pool.stats()['discarded'], 1)
+        self.assertEqual(pool.stats()['size'], 1)
+
+    def test_failed_factory_frees_slot(self):
+        calls = []
+
+        def flaky():
+            calls.append(1)
+            if len(calls) == 1:
+                raise OSError('connection refused')
+            return DummyConnection()
+
+        pool = ConnectionPool(flaky, max_size=1, timeout=0.01)
+        with self.assertRaises(OSError):
+            pool.acquire()
+
+        self.assertIsInstance(pool.acquire(), DummyConnection)
+
+    def test_discarded_connection_closed(self):
+        pool = ConnectionPool(self.factory, max_size=1)
+        connection = pool.acquire()
+
+        pool.release(connection, discard=True)
+
+        self.assertTrue(connection.closed)
+        self.assertEqual(pool.stats()['size'], 0)
+
+    def test_close_all_closes_busy_connections_on_release(self):
+        pool = ConnectionPool(self.factory, max_size=2)
+        idle, busy = pool.acquire(), pool.acquire()
+        pool.release(idle)
+
+        pool.close_all()
+
+        self.assertTrue(idle.closed)
+        self.assertFalse(busy.closed)
+        pool.release(busy)
+        self.assertTrue(busy.closed)
+        self.assertEqual(pool.stats()['size'], 0)
+
+
+class PoolRegistryTests(SimpleTestCase):
+    def setUp(self):
+        self.addCleanup(close_pools, 'pool-test')
+
+    def pool(self, conn_params):
+        return get_pool(
+            'pool-test', pool_key(conn_params),
+            lambda: ConnectionPool(DummyConnection))
+
+    def test_pool_reused_for_same_parameters(self):
+        self.assertIs(self.pool({'database': 'app', 'options': {}}),
+                      self.pool({'options': {}, 'database': 'app'}))
+
+    def test_changed_parameters_drain_old_pool(self):
+        old = self.pool({'database': 'app'})
+        connection = old.acquire()
+        old.release(connection)
+
+        new = self.pool({'database': 'test_app'})
+
+        self.assertIsNot(new, old)
+        self.assertTrue(connection.closed)
+        self.assertEqual(old.stats()['size'], 0)
+
+    def test_close_pools_drains(self):
+        pool = self.pool({'database': 'test_app'})
+        connection = pool.acquire()
+        pool.release(connection)
+
+        close_pools('pool-test')
+
+        self.assertTrue(connection.closed)
+        self.assertIsNot(self.pool({'database': 'test_app'}), pool)
@@ -0,0 +1,75 @@
+"""Tests for the orjson backed renderer and parser"""
+import datetime
+import io
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+
+from core.parsers import FastJSONParser
+from core.renderers import FastJSONRenderer
+
+
+SAMPLE = {
+    'results': [{
+        'id': 1,
+        'title': 'Thai curry \u2028 é',
+        'price': '5.25',
+        'tags': [{'id': 2, 'name': 'dinner'}],
+        'created': datetime.datetime(2024, 1, 2, 3, 4, 5, 678901,
+                                     tzinfo=datetime.timezone.utc),
+        'link': None,
+    }],
+    'next': None,
+}
+
+
+class FastJSONRendererTests(SimpleTestCase):
+    def test_matches_drf_renderer(self):
+        self.assertEqual(FastJSONRenderer().render(SAMPLE),
+                         JSONRenderer().render(SAMPLE))
+
+    def test_decimal_rendered_losslessly(self):
+        data = {'price': Decimal('12345678901234567890.12')}
+        expected = b'{"price":"12345678901234567890.12"}'
+
+        self.assertEqual(FastJSONRenderer().render(data), expected)
+        with patch('core.renderers.orjson', None):
+            self.assertEqual(FastJSONRenderer().render(data), expected)
+
+    def test_indent_falls_back(self):
+        res = FastJSONRenderer().render(
+            {'a': 1}, 'application/json; indent=2')
+
+        self.assertEqual(res, b'{\n  "a": 1\n}')
+
+    def test_none_renders_empty(self):
+        self.assertEqual(FastJSONRenderer().render(None), b'')
+
+
+class FastJSONParserTests(SimpleTestCase):
+    def parse(self, body, **context):
+        return FastJSONParser().parse(io.BytesIO(body), parser_context=context)
+
+    def test_parse(self):
+        self.assertEqual(self.parse(b'{"title": "curry", "price": 2.5}'),
+                         {'title': 'curry', 'price': 2.5})
+
+    def test_parse_without_orjson_keeps_decimals(self):
+        with patch('core.parsers.orjson', None):
+            data = self.parse(b'{"price": 2.10}')
+
+        self.assertEqual(data['price'], Decimal('2.10'))
+
+    def test_parse_other_encoding(self):
+        data = self.parse('{"title": "crêpe"}'.encode('latin-1'),
+                          encoding='latin-1')
+
+        self.assertEqual(data, {'title': 'crêpe'})
+
+    def test_parse_error(self):
+        for body in [b'{"title": ', b'{"price": NaN}']:
+            with self.subTest(body=body), self.assertRaises(ParseError):
+                self.parse(body)
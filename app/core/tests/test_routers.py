@@ -0,0 +1,160 @@
+"""Tests for read replica routing"""
+from unittest import skipUnless
+from unittest.mock import patch
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connections
+from django.test import (
+    SimpleTestCase, TestCase, TransactionTestCase, override_settings)
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Recipe
+from core.routers import (
+    ReplicaRouter, is_pinned, pin_seconds, pin_to_primary, replica_lag,
+    replica_reads)
+
+
+RECIPES_URL = reverse('recipe:recipe-list')
+TAGS_URL = reverse('recipe:tag-list')
+LIST_USER_URL = reverse('user:list')
+ME_URL = reverse('user:me')
+
+
+@override_settings(DATABASE_REPLICAS=['replica_a', 'replica_b'],
+                   REPLICA_MAX_LAG_SECONDS=10)
+class ReplicaRouterTests(SimpleTestCase):
+    def setUp(self):
+        self.router = ReplicaRouter()
+        token = replica_reads.set(True)
+        self.addCleanup(replica_reads.reset, token)
+
+    @patch('core.routers.replica_lag', return_value=0)
+    def test_reads_go_to_replica(self, lag):
+        self.assertIn(self.router.db_for_read(Recipe),
+                      {'replica_a', 'replica_b'})
+        self.assertEqual(self.router.db_for_write(Recipe), 'default')
+
+    @patch('core.routers.replica_lag', return_value=0)
+    def test_reads_outside_replica_requests_use_primary(self, lag):
+        replica_reads.set(False)
+
+        self.assertIsNone(self.router.db_for_read(Recipe))
+
+    @patch('core.routers.replica_lag',
+           side_effect=lambda alias: 60 if alias == 'replica_a' else 1)
+    def test_lagging_replica_skipped(self, lag):
+        for _ in range(10):
+            self.assertEqual(self.router.db_for_read(Recipe), 'replica_b')
+
+    @patch('core.routers.replica_lag', return_value=float('inf'))
+    def test_falls_back_to_primary_when_all_lag(self, lag):
+        self.assertIsNone(self.router.db_for_read(Recipe))
+
+    def test_no_migrations_on_replicas(self):
+        self.assertFalse(self.router.allow_migrate('replica_a', 'core'))
+        self.assertIsNone(self.router.allow_migrate('default', 'core'))
+
+
+class ReplicaLagTests(TestCase):
+    def test_non_postgres_has_no_lag(self):
+        self.assertEqual(replica_lag('default'), 0.0)
+
+    @override_settings(REPLICA_PIN_SECONDS=5, REPLICA_MAX_LAG_SECONDS=10,
+                       REPLICA_LAG_CHECK_SECONDS=2.5)
+    def test_pin_covers_max_lag(self):
+        self.assertEqual(pin_seconds(), 13)
+
+        pin_to_primary(42)
+
+        self.assertTrue(is_pinned(42))
+
+
+@patch('core.routers.choose_replica', return_value='default')
+class ReplicaReadViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            'test@example.com', 'testpass123')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_safe_requests_read_from_replica(self, choose_replica):
+        for url in (RECIPES_URL, TAGS_URL, LIST_USER_URL):
+            with self.subTest(url=url):
+                choose_replica.reset_mock()
+
+                self.client.get(url)
+
+                choose_replica.assert_called()
+        self.assertFalse(replica_reads.get())
+
+    def test_writes_pin_user_to_primary(self, choose_replica):
+        res = self.client.post(RECIPES_URL, {
+            'title': 'new', 'time_minutes': 5, 'price': '1.00'})
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        choose_replica.reset_mock()
+
+        self.client.get(RECIPES_URL)
+
+        choose_replica.assert_not_called()
+
+    def test_profile_update_pins_user_to_primary(self, choose_replica):
+        res = self.client.patch(ME_URL, {'name': 'renamed'})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        choose_replica.reset_mock()
+
+        self.client.get(LIST_USER_URL)
+
+        choose_replica.assert_not_called()
+
+    def test_failed_write_does_not_pin(self, choose_replica):
+        self.client.post(RECIPES_URL, {'title': 'missing fields'})
+        choose_replica.reset_mock()
+
+        self.client.get(RECIPES_URL)
+
+        choose_replica.assert_called()
+
+
+@skipUnless('replica_test' in settings.DATABASES,
+            'needs the replica_test mirror alias from app.test_settings')
+@override_settings(DATABASE_REPLICAS=['replica_test'])
+class MirroredReplicaTests(TransactionTestCase):
+    """Routing against a second real connection mirroring the primary."""
+    databases = '__all__'
+
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            'test@example.com', 'testpass123')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def recipe_queries(self, method, *args):
+        with CaptureQueriesContext(connections['default']) as primary, \
+                CaptureQueriesContext(connections['replica_test']) as replica:
+            res = getattr(self.client, method)(*args)
+        self.assertLess(res.status_code, 400)
+        return [
+            [query for query in captured if 'core_recipe' in query['sql']]
+            for captured in (primary, replica)
+        ]
+
+    def test_reads_replica_writes_and_pinned_reads_primary(self):
+        primary, replica = self.recipe_queries('get', RECIPES_URL)
+        self.assertEqual(primary, [])
+        self.assertNotEqual(replica, [])
+
+        primary, replica = self.recipe_queries('post', RECIPES_URL, {
+            'title': 'new', 'time_minutes': 5, 'price': '1.00'})
+        self.assertNotEqual(primary, [])
+        self.assertEqual(replica, [])
+
+        primary, replica = self.recipe_queries('get', RECIPES_URL)
+        self.assertNotEqual(primary, [])
+        self.assertEqual(replica, [])
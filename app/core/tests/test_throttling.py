@@ -0,0 +1,132 @@
+"""Tests for the token-bucket throttles"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.throttling import CacheBucketStore, LocalBucketStore, local_store
+
+
+TOKEN_URL = reverse('user:token')
+CREATE_USER_URL = reverse('user:create')
+RECIPES_URL = reverse('recipe:recipe-list')
+
+
+def rates(**rates):
+    return override_settings(REST_FRAMEWORK={
+        **settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': rates})
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class BucketStoreTests(SimpleTestCase):
+    def assertBucket(self, store, clock):
+        results = [store.consume('key', rate=0.5, capacity=2)
+                   for _ in range(3)]
+
+        self.assertEqual([allowed for allowed, _ in results],
+                         [True, True, False])
+        self.assertAlmostEqual(results[2][1], 2.0)
+        clock.now += 2
+        self.assertTrue(store.consume('key', rate=0.5, capacity=2)[0])
+        self.assertFalse(store.consume('key', rate=0.5, capacity=2)[0])
+        self.assertTrue(store.consume('other', rate=0.5, capacity=2)[0])
+
+    def test_local_store(self):
+        clock = Clock()
+        self.assertBucket(LocalBucketStore(clock=clock), clock)
+
+    def test_cache_store(self):
+        cache.clear()
+        clock = Clock()
+        self.assertBucket(CacheBucketStore(cache, clock=clock), clock)
+
+    def test_local_store_bounded(self):
+        store = LocalBucketStore(max_keys=2)
+        for key in 'abc':
+            store.consume(key, rate=1, capacity=1)
+
+        self.assertEqual(list(store._buckets), ['b', 'c'])
+
+
+class ThrottledEndpointTests(TestCase):
+    def setUp(self):
+        local_store.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            'test@example.com', 'test-123')
+
+    def login(self, ip, email='test@example.com', **extra):
+        return self.client.post(TOKEN_URL, {
+            'email': email, 'password': 'test-123'}, REMOTE_ADDR=ip, **extra)
+
+    @rates(login_ip='2/min', login_email='100/min')
+    def test_login_per_ip(self):
+        self.login('10.0.0.1')
+        self.login('10.0.0.1')
+
+        res = self.login('10.0.0.1')
+
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn('Retry-After', res)
+        self.assertEqual(self.login('10.0.0.2').status_code,
+                         status.HTTP_200_OK)
+
+    @rates(login_ip='2/min', login_email='100/min')
+    def test_spoofed_forwarded_for_shares_bucket(self):
+        for forwarded in ('1.1.1.1', '2.2.2.2'):
+            self.login('10.0.0.1', HTTP_X_FORWARDED_FOR=forwarded)
+
+        res = self.login('10.0.0.1', HTTP_X_FORWARDED_FOR='3.3.3.3')
+
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    @rates(login_ip='100/min', login_email='2/min')
+    def test_login_per_email(self):
+        self.login('10.0.0.1')
+        self.login('10.0.0.2', email='TEST@example.com ')
+
+        res = self.login('10.0.0.3')
+
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertNotEqual(
+            self.login('10.0.0.3', email='other@example.com').status_code,
+            status.HTTP_429_TOO_MANY_REQUESTS)
+
+    @rates(user_create_ip='1/hour')
+    def test_user_create_per_ip(self):
+        payload = {'email': 'a@example.com', 'password': 'test-123',
+                   'name': 'a'}
+        self.client.post(CREATE_USER_URL, payload)
+        payload['email'] = 'b@example.com'
+
+        res = self.client.post(CREATE_USER_URL, payload)
+
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    @rates(recipe_write='1/min')
+    def test_recipe_writes_per_user(self):
+        cache.clear()
+        self.client.force_authenticate(self.user)
+        payload = {'title': 'r', 'time_minutes': 1, 'price': '1.00'}
+        self.client.post(RECIPES_URL, payload)
+
+        res = self.client.post(RECIPES_URL, payload)
+
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(self.client.get(RECIPES_URL).status_code,
+                         status.HTTP_200_OK)
+
+    def test_unthrottled_without_rates(self):
+        for _ in range(5):
+            self.assertEqual(self.login('10.0.0.1').status_code,
+                             status.HTTP_200_OK)
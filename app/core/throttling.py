@@ -0,0 +1,142 @@
+"""Token-bucket throttles for the login, sign-up and recipe write endpoints."""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class LocalBucketStore:
+    """
+    Buckets held in this process, so each worker process throttles on its
+    own. Least recently used keys are dropped beyond ``max_keys``.
+    """
+
+    def __init__(self, max_keys=100000, clock=time.monotonic):
+        self.max_keys = max_keys
+        self.clock = clock
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def consume(self, key, rate, capacity):
+        """Take one token; return (allowed, seconds until one is free)."""
+        now = self.clock()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (capacity, now))
+            tokens, wait = _take(tokens, now - updated, rate, capacity)
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return wait == 0, wait
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+class CacheBucketStore:
+    """
+    Buckets in a Django cache shared by every process. The read-modify-write
+    is not atomic, so concurrent requests may slightly overshoot a bucket.
+    """
+
+    def __init__(self, cache, clock=time.time):
+        self.cache = cache
+        self.clock = clock
+
+    def consume(self, key, rate, capacity):
+        now = self.clock()
+        tokens, updated = self.cache.get(key, (capacity, now))
+        tokens, wait = _take(tokens, now - updated, rate, capacity)
+        # An untouched bucket is full again after capacity / rate seconds.
+        self.cache.set(key, (tokens, now), int(capacity / rate) + 1)
+        return wait == 0, wait
+
+
+def _take(tokens, elapsed, rate, capacity):
+    tokens = min(capacity, tokens + max(elapsed, 0) * rate)
+    if tokens >= 1:
+        return tokens - 1, 0
+    return tokens, (1 - tokens) / rate
+
+
+local_store = LocalBucketStore(
+    max_keys=getattr(settings, 'THROTTLE_BUCKETS', {}).get('MAX_KEYS', 100000))
+
+
+def get_store():
+    backend = getattr(settings, 'THROTTLE_BUCKETS', {}).get('BACKEND')
+    if backend:
+        return CacheBucketStore(caches[backend])
+    return local_store
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """
+    SimpleRateThrottle with a token bucket in place of the request history:
+    a rate of ``N/period`` allows bursts of N refilled at N per period, and
+    each check is O(1) instead of O(N). Buckets live in ``store``, or the
+    configured store when unset.
+    """
+    store = None
+
+    def get_rate(self):
+        """The scope's current rate; scopes without one are not throttled."""
+        return api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+
+    def allow_request(self, request, view):
+        self.wait_seconds = None
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+        store = self.store if self.store is not None else get_store()
+        allowed, wait = store.consume(
+            self.key, self.num_requests / self.duration, self.num_requests)
+        self.wait_seconds = wait
+        return allowed
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class LoginIPThrottle(TokenBucketThrottle):
+    scope = 'login_ip'
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {
+            'scope': self.scope, 'ident': self.get_ident(request)}
+
+
+class LoginEmailThrottle(TokenBucketThrottle):
+    """Limit attempts per account, whichever addresses they come from."""
+    scope = 'login_email'
+
+    def get_cache_key(self, request, view):
+        data = request.data
+        email = data.get('email') if hasattr(data, 'get') else None
+        if not isinstance(email, str) or not email.strip():
+            return None
+        digest = hashlib.md5(email.strip().lower().encode()).hexdigest()
+        return self.cache_format % {'scope': self.scope, 'ident': digest}
+
+
+class CreateUserIPThrottle(LoginIPThrottle):
+    scope = 'user_create_ip'
+
+
+class RecipeWriteThrottle(TokenBucketThrottle):
+    scope = 'recipe_write'
+
+    def get_cache_key(self, request, view):
+        if request.method in SAFE_METHODS or not request.user.is_authenticated:
+            return None
+        return self.cache_format % {
+            'scope': self.scope, 'ident': request.user.pk}
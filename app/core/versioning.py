@@ -0,0 +1,42 @@
+"""Per-user version stamps for the recipe and tag data."""
+import uuid
+
+from django.core.cache import cache
+from django.db import transaction
+
+
+def _version_key(user_id):
+    return f'api-version:{user_id}'
+
+
+def get_version(user_id):
+    """Return the user's current data version, creating one if missing."""
+    key = _version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(user_id):
+    """Invalidate everything cached against the user's current version."""
+    cache.set(_version_key(user_id), uuid.uuid4().hex, None)
+
+
+def bump_version_on_commit(user_id, using=None):
+    """
+    Bump once the current transaction commits (at once outside one), so a
+    read racing the write cannot cache the old rows under the new version.
+    """
+    transaction.on_commit(lambda: bump_version(user_id), using=using)
+
+
+async def aget_version(user_id):
+    """Async variant of get_version for the async read views."""
+    key = _version_key(user_id)
+    version = await cache.aget(key)
+    if version is None:
+        await cache.aadd(key, uuid.uuid4().hex, None)
+        version = await cache.aget(key)
+    return version
@@ -0,0 +1,29 @@
+"""
+Gunicorn settings for the production server: ``gunicorn -c gunicorn.conf.py``.
+
+Defaults to uvicorn workers serving the ASGI app, so the async read views
+(API_ASYNC_READS) run on the event loop. Set GUNICORN_WORKER_CLASS=gthread
+and GUNICORN_APP=app.wsgi:application to serve the WSGI app instead.
+"""
+import multiprocessing
+import os
+
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+wsgi_app = os.environ.get('GUNICORN_APP', 'app.asgi:application')
+worker_class = os.environ.get(
+    'GUNICORN_WORKER_CLASS', 'uvicorn.workers.UvicornWorker')
+workers = int(os.environ.get(
+    'WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+# Only used by the gthread worker class.
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+graceful_timeout = 30
+keepalive = 5
+# Recycle workers now and then to cap slow memory growth.
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 2000))
+max_requests_jitter = max_requests // 10
+
+accesslog = '-'
+errorlog = '-'
@@ -0,0 +1,72 @@
+"""Query parameter filters for the recipe and tag lists."""
+from django.db.models import Exists, OuterRef
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+from core.models import Recipe
+
+
+MAX_FILTER_TAGS = 20
+
+# Bounded like the columns they compare against, so out-of-range input is
+# a 400 instead of a database error.
+PRICE = serializers.DecimalField(max_digits=5, decimal_places=2)
+MINUTES = serializers.IntegerField(min_value=0, max_value=2 ** 31 - 1)
+FLAG = serializers.BooleanField()
+
+
+def _int_list(params, name):
+    try:
+        values = [int(value) for value in params[name].split(',') if value]
+    except ValueError:
+        raise ValidationError({name: ['Expected comma separated ids.']})
+    if len(values) > MAX_FILTER_TAGS:
+        raise ValidationError(
+            {name: [f'At most {MAX_FILTER_TAGS} ids are allowed.']})
+    return values
+
+
+def _param(params, name, field):
+    try:
+        return field.run_validation(params[name])
+    except ValidationError as exc:
+        raise ValidationError({name: exc.detail})
+
+
+def _tagged(**lookups):
+    """Semi-join on the through table, so matches never duplicate rows."""
+    return Exists(Recipe.tags.through.objects.filter(
+        recipe_id=OuterRef('pk'), **lookups))
+
+
+def filter_recipes(queryset, params):
+    """
+    Apply ``tags`` (with ``tags_match=any|all``), ``max_price`` and
+    ``max_time`` from the query parameters.
+    """
+    if params.get('tags'):
+        tag_ids = _int_list(params, 'tags')
+        match = params.get('tags_match', 'any')
+        if match == 'all':
+            for tag_id in tag_ids:
+                queryset = queryset.filter(_tagged(tag_id=tag_id))
+        elif match == 'any':
+            queryset = queryset.filter(_tagged(tag_id__in=tag_ids))
+        else:
+            raise ValidationError({'tags_match': ['Expected any or all.']})
+    if params.get('max_price'):
+        queryset = queryset.filter(
+            price__lte=_param(params, 'max_price', PRICE))
+    if params.get('max_time'):
+        queryset = queryset.filter(
+            time_minutes__lte=_param(params, 'max_time', MINUTES))
+    return queryset
+
+
+def filter_tags(queryset, params):
+    """Apply ``assigned_only`` to keep tags used by at least one recipe."""
+    if params.get('assigned_only') and _param(
+            params, 'assigned_only', FLAG):
+        queryset = queryset.filter(Exists(Recipe.tags.through.objects.filter(
+            tag_id=OuterRef('pk'))))
+    return queryset
@@ -0,0 +1,65 @@
+"""Django command to compare serializer and reader throughput"""
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Prefetch
+
+from core.models import Recipe, Tag
+from recipe.readers import RecipeReader
+from recipe.serializers import RecipeSerializer
+
+
+class Command(BaseCommand):
+    """Microbenchmark of the recipe list read paths on seeded rows"""
+    help = ('Compare rows/second of RecipeSerializer and RecipeReader. '
+            'Seeded rows are rolled back afterwards.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=2000)
+        parser.add_argument('--tags', type=int, default=3)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            user = self._seed(options['rows'], options['tags'])
+            queryset = Recipe.objects.filter(user=user).order_by('-id')
+            paths = {
+                'serializer': lambda: RecipeSerializer(
+                    queryset.prefetch_related(Prefetch(
+                        'tags', queryset=Tag.objects.order_by('id'))),
+                    many=True).data,
+                'reader': lambda: self._read(queryset),
+            }
+            for name, run in paths.items():
+                best = min(self._time(run) for _ in range(options['repeat']))
+                self.stdout.write(
+                    f'{name:>10}: {options["rows"] / best:,.0f} rows/s '
+                    f'({best * 1000:.1f} ms)')
+            transaction.set_rollback(True)
+
+    def _read(self, queryset):
+        reader = RecipeReader(RecipeSerializer())
+        return reader.represent(reader.values(queryset))
+
+    def _time(self, run):
+        started = time.perf_counter()
+        run()
+        return time.perf_counter() - started
+
+    def _seed(self, rows, tag_count):
+        user = get_user_model().objects.create_user(
+            'bench-readers@example.com', 'bench-password')
+        tags = Tag.objects.bulk_create(
+            [Tag(user=user, name=f'tag {i}') for i in range(tag_count)])
+        recipes = Recipe.objects.bulk_create([
+            Recipe(user=user, title=f'recipe {i}', time_minutes=i % 120,
+                   price='9.99', link='http://example.com')
+            for i in range(rows)
+        ])
+        Recipe.tags.through.objects.bulk_create([
+            Recipe.tags.through(recipe_id=recipe.id, tag_id=tag.id)
+            for recipe in recipes for tag in tags
+        ])
+        return user
@@ -0,0 +1,131 @@
+"""View mixins shared by the recipe viewsets."""
+import hashlib
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.http import Http404
+from django.utils.cache import patch_vary_headers
+from django.utils.http import urlencode
+from rest_framework import status
+from rest_framework.response import Response
+
+from core.versioning import aget_version, get_version
+
+
+class ConditionalListMixin:
+    """
+    Cache list responses per user and answer conditional GETs.
+
+    The ETag and cache key are derived from the user's data version (bumped
+    by signals on every recipe/tag write) and the query parameters, so an
+    unchanged poll costs a cache lookup instead of queries and serialization.
+    """
+    list_cache_timeout = 300
+
+    def _list_etag(self, request, version):
+        params = urlencode(sorted(request.query_params.lists()), doseq=True)
+        digest = hashlib.md5(
+            f'{request.path}?{params}:{version}'.encode()).hexdigest()
+        return digest, f'"{digest}"'
+
+    def _not_modified(self, request, etag):
+        if_none_match = request.headers.get('If-None-Match', '')
+        return etag in [tag.strip() for tag in if_none_match.split(',')]
+
+    def _finalize_list(self, response, etag):
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, no-cache'
+        patch_vary_headers(response, ['Authorization'])
+        return response
+
+    def list(self, request, *args, **kwargs):
+        digest, etag = self._list_etag(request, get_version(request.user.id))
+        if self._not_modified(request, etag):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            cache_key = f'api-list:{request.user.id}:{digest}'
+            data = cache.get(cache_key)
+            if data is None:
+                response = super().list(request, *args, **kwargs)
+                cache.set(cache_key, response.data, self.list_cache_timeout)
+            else:
+                response = Response(data)
+        return self._finalize_list(response, etag)
+
+    async def alist(self, request, *args, **kwargs):
+        digest, etag = self._list_etag(
+            request, await aget_version(request.user.id))
+        if self._not_modified(request, etag):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            cache_key = f'api-list:{request.user.id}:{digest}'
+            data = await cache.aget(cache_key)
+            if data is None:
+                response = await super().alist(request, *args, **kwargs)
+                await cache.aset(
+                    cache_key, response.data, self.list_cache_timeout)
+            else:
+                response = Response(data)
+        return self._finalize_list(response, etag)
+
+
+class FastReadMixin:
+    """
+    Serve list and retrieve through ``reader_class`` instead of the
+    serializer. Writes, and all reads when API_FAST_READS is off, keep
+    using the regular serializer path. ``alist`` and ``aretrieve`` are the
+    same reads on the async ORM, used by AsyncReadView.
+    """
+    reader_class = None
+
+    def get_reader(self):
+        return self.reader_class(self.get_serializer())
+
+    def _detail_rows(self, reader, kwargs):
+        lookup = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.filter_queryset(self.get_queryset())
+        # A malformed pk is a missing object, as in DRF's get_object_or_404.
+        try:
+            return reader.values(
+                queryset.filter(**{self.lookup_field: kwargs[lookup]}))
+        except (TypeError, ValueError, ValidationError):
+            raise Http404
+
+    def _detail_response(self, request, rows):
+        if not rows:
+            raise Http404
+        self.check_object_permissions(request, rows[0])
+        return Response(rows[0])
+
+    def list(self, request, *args, **kwargs):
+        if not settings.API_FAST_READS:
+            return super().list(request, *args, **kwargs)
+        reader = self.get_reader()
+        rows = reader.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(reader.represent(page))
+        return Response(reader.represent(rows))
+
+    async def alist(self, request, *args, **kwargs):
+        reader = self.get_reader()
+        rows = reader.values(self.filter_queryset(self.get_queryset()))
+        # DRF's cursor pagination evaluates the page itself, synchronously.
+        page = await sync_to_async(self.paginate_queryset)(rows)
+        if page is not None:
+            return self.get_paginated_response(await reader.arepresent(page))
+        return Response(await reader.arepresent(rows))
+
+    def retrieve(self, request, *args, **kwargs):
+        if not settings.API_FAST_READS:
+            return super().retrieve(request, *args, **kwargs)
+        reader = self.get_reader()
+        rows = reader.represent(self._detail_rows(reader, kwargs))
+        return self._detail_response(request, rows)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        reader = self.get_reader()
+        rows = await reader.arepresent(self._detail_rows(reader, kwargs))
+        return self._detail_response(request, rows)
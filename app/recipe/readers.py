@@ -0,0 +1,101 @@
+"""
+Read-only fast paths that build responses straight from ``values()`` rows.
+
+Each reader mirrors a serializer's output (including sparse fields) without
+instantiating model objects or running DRF's per-field machinery per row.
+"""
+from collections import defaultdict
+
+from django.db.models import QuerySet
+from rest_framework import serializers
+
+from core.models import Recipe
+
+
+class ValuesReader:
+    relations = ()
+
+    def __init__(self, serializer):
+        self.fields = list(serializer.fields)
+        self.columns = list(dict.fromkeys(
+            ['id'] + [name for name in self.fields
+                      if name not in self.relations]))
+        # Only fields whose representation differs from the database value
+        # need converting; everything else is copied as is.
+        self.converters = {
+            name: field.to_representation
+            for name, field in serializer.fields.items()
+            if isinstance(field, serializers.DecimalField)
+        }
+
+    def values(self, queryset):
+        """Turn a queryset into the dict rows the reader consumes."""
+        ordering = [field.lstrip('-') for field in queryset.query.order_by
+                    if isinstance(field, str)]
+        return queryset.prefetch_related(None).values(
+            *dict.fromkeys(self.columns + ordering))
+
+    def fetch_related(self, rows):
+        return {}
+
+    async def afetch_related(self, rows):
+        return {}
+
+    def represent(self, rows):
+        rows = list(rows)
+        return self._build(rows, self.fetch_related(rows))
+
+    async def arepresent(self, rows):
+        """Async variant of represent, fetching through the async ORM."""
+        if isinstance(rows, QuerySet):
+            rows = [row async for row in rows]
+        return self._build(rows, await self.afetch_related(rows))
+
+    def _build(self, rows, related):
+        converters = self.converters
+        output = []
+        for row in rows:
+            item = {}
+            for name in self.fields:
+                if name in related:
+                    item[name] = related[name].get(row['id'], [])
+                elif name in converters:
+                    value = row[name]
+                    item[name] = None if value is None else converters[name](value)
+                else:
+                    item[name] = row[name]
+            output.append(item)
+        return output
+
+
+class TagReader(ValuesReader):
+    pass
+
+
+class RecipeReader(ValuesReader):
+    relations = ('tags',)
+
+    def _tags_query(self, rows):
+        if 'tags' not in self.fields or not rows:
+            return None
+        return Recipe.tags.through.objects.filter(
+            recipe_id__in=[row['id'] for row in rows]
+        ).order_by('tag_id').values_list('recipe_id', 'tag_id', 'tag__name')
+
+    def _group_tags(self, through_rows):
+        tags = defaultdict(list)
+        for recipe_id, tag_id, name in through_rows:
+            tags[recipe_id].append({'id': tag_id, 'name': name})
+        return {'tags': tags}
+
+    def fetch_related(self, rows):
+        query = self._tags_query(rows)
+        if query is None:
+            return {}
+        return self._group_tags(query)
+
+    async def afetch_related(self, rows):
+        query = self._tags_query(rows)
+        if query is None:
+            return {}
+        return self._group_tags([row async for row in query])
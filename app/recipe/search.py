@@ -0,0 +1,47 @@
+"""Full-text search over recipe titles and descriptions."""
+import re
+
+from django.db import connection
+from django.db.models import BooleanField, Case, FloatField, Q, Value, When
+from django.db.models.expressions import RawSQL
+
+
+MAX_TERMS = 8
+TERM_RE = re.compile(r'\w+')
+
+# Backed by the generated search_vector column and GIN index added in
+# core/migrations/0005_recipe_search_vector.py.
+PG_MATCH = "core_recipe.search_vector @@ to_tsquery('english', %s)"
+PG_RANK = ("ts_rank(core_recipe.search_vector, "
+           "to_tsquery('english', %s))::float8")
+
+
+def search_recipes(queryset, query):
+    """
+    Filter recipes matching every term (as a prefix) in the query and
+    annotate them with a ``rank``; title matches rank above descriptions.
+    Ranks tie often, so KeysetPagination pages on (rank, id) together.
+    """
+    terms = TERM_RE.findall(query.lower())[:MAX_TERMS]
+    if not terms:
+        return queryset
+    if connection.vendor == 'postgresql':
+        tsquery = ' & '.join(f'{term}:*' for term in terms)
+        return queryset.filter(
+            RawSQL(PG_MATCH, [tsquery], output_field=BooleanField())
+        ).annotate(
+            rank=RawSQL(PG_RANK, [tsquery], output_field=FloatField())
+        ).order_by('-rank', '-id')
+
+    # Fallback for other backends: an unindexed substring scan.
+    for term in terms:
+        queryset = queryset.filter(
+            Q(title__icontains=term) | Q(description__icontains=term))
+    rank = Value(0.0)
+    for term in terms:
+        rank = rank + Case(
+            When(title__icontains=term, then=Value(1.0)),
+            default=Value(0.4),
+            output_field=FloatField()
+        )
+    return queryset.annotate(rank=rank).order_by('-rank', '-id')
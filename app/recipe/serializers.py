@@ -1,6 +1,8 @@
+from django.db import transaction
 from rest_framework import serializers
 
-from core.models import Recipe, Tag
+from core.models import Recipe, RecipeStats, Tag, TagStats
+from core.signals import recipes_bulk_changed
 
 
 class TagSerializer(serializers.ModelSerializer):
@@ -9,31 +11,124 @@ class TagSerializer(serializers.ModelSerializer):
         fields = ['id', 'name']
         read_only_fields = ['id']
 
+    def validate_name(self, value):
+        """Renames must keep tag_unique_user_name; nested names are reused."""
+        if self.instance is None:
+            return value
+        if Tag.objects.filter(
+                user=self.context['request'].user, name=value
+        ).exclude(pk=self.instance.pk).exists():
+            raise serializers.ValidationError(
+                'You already have a tag with this name.')
+        return value
 
-class RecipeSerializer(serializers.ModelSerializer):
+
+class RecipeListSerializer(serializers.ListSerializer):
+    """Writes many recipes with batched queries instead of one per item."""
+    batch_size = 500
+
+    def _set_tags(self, recipes, tags, created=False):
+        user = self.context['request'].user
+        tag_ids = {tag.name: tag.id for tag in Tag.objects.get_or_create_many(
+            user, [tag['name'] for item in tags if item for tag in item])}
+        wanted = {
+            (recipe.id, tag_ids[tag['name']])
+            for recipe, item in zip(recipes, tags) if item for tag in item
+        }
+        through = Recipe.tags.through
+        if not created:
+            recipe_ids = [
+                recipe.id for recipe, item in zip(recipes, tags)
+                if item is not None
+            ]
+            stale = []
+            for row_id, recipe_id, tag_id in through.objects.filter(
+                    recipe_id__in=recipe_ids).values_list(
+                    'id', 'recipe_id', 'tag_id'):
+                if (recipe_id, tag_id) in wanted:
+                    wanted.discard((recipe_id, tag_id))
+                else:
+                    stale.append(row_id)
+            if stale:
+                through.objects.filter(id__in=stale).delete()
+        through.objects.bulk_create(
+            [through(recipe_id=recipe_id, tag_id=tag_id)
+             for recipe_id, tag_id in wanted],
+            batch_size=self.batch_size,
+            ignore_conflicts=True
+        )
+
+    @transaction.atomic
+    def create(self, validated_data):
+        tags = [item.pop('tags', None) for item in validated_data]
+        recipes = Recipe.objects.bulk_create(
+            [Recipe(**item) for item in validated_data],
+            batch_size=self.batch_size
+        )
+        self._set_tags(recipes, tags, created=True)
+        recipes_bulk_changed.send(
+            sender=Recipe, user=self.context['request'].user)
+        return recipes
+
+    @transaction.atomic
+    def update(self, instances, validated_data):
+        tags = [item.pop('tags', None) for item in validated_data]
+        fields = set()
+        for recipe, item in zip(instances, validated_data):
+            for attr, value in item.items():
+                setattr(recipe, attr, value)
+                fields.add(attr)
+        if fields:
+            Recipe.objects.bulk_update(
+                instances, fields, batch_size=self.batch_size)
+        self._set_tags(instances, tags)
+        recipes_bulk_changed.send(
+            sender=Recipe, user=self.context['request'].user)
+        return instances
+
+
+class SparseFieldsMixin:
+    """Drop fields not in ``context['fields']`` when that is set."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fields = self.context.get('fields')
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+class RecipeSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     tags = TagSerializer(many=True, required=False)
 
     class Meta:
         model = Recipe
         fields = ['id', 'title', 'time_minutes', 'price', 'link', 'tags']
         read_only_fields = ['id']
+        list_serializer_class = RecipeListSerializer
 
-    def _get_or_create_tags(self, tags, recipe):
+    def _get_or_create_tags(self, tags, recipe, created=False):
         auth_user = self.context['request'].user
-        for tag in tags:
-            tag_obj, _ = Tag.objects.get_or_create(user=auth_user, **tag)
-            recipe.tags.add(tag_obj)
+        tag_ids = {tag.id for tag in Tag.objects.get_or_create_many(
+            auth_user, [tag['name'] for tag in tags])}
+        current = set() if created else {tag.id for tag in recipe.tags.all()}
+        if current - tag_ids:
+            recipe.tags.remove(*(current - tag_ids))
+        if tag_ids - current:
+            recipe.tags.add(*(tag_ids - current))
 
+    @transaction.atomic
     def create(self, validated_data):
         tags = validated_data.pop('tags', [])
         recipe = Recipe.objects.create(**validated_data)
-        self._get_or_create_tags(tags, recipe)
+        if tags:
+            self._get_or_create_tags(tags, recipe, created=True)
         return recipe
 
+    @transaction.atomic
     def update(self, instance, validated_data):
         tags = validated_data.pop('tags', None)
         if tags is not None:
-            instance.tags.clear()
             self._get_or_create_tags(tags, instance)
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
@@ -44,3 +139,30 @@ class RecipeSerializer(serializers.ModelSerializer):
 class RecipeDetailSerializer(RecipeSerializer):
     class Meta(RecipeSerializer.Meta):
         fields = RecipeSerializer.Meta.fields + ['description']
+
+
+class RecipeBulkDeleteSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(), allow_empty=False)
+
+
+class TagUsageSerializer(serializers.ModelSerializer):
+    id = serializers.IntegerField(source='tag_id')
+    name = serializers.CharField(source='tag.name')
+
+    class Meta:
+        model = TagStats
+        fields = ['id', 'name', 'recipe_count']
+
+
+class RecipeStatsSerializer(serializers.ModelSerializer):
+    avg_time_minutes = serializers.FloatField(allow_null=True)
+    avg_price = serializers.DecimalField(
+        max_digits=14, decimal_places=2, allow_null=True)
+    top_tags = TagUsageSerializer(many=True)
+
+    class Meta:
+        model = RecipeStats
+        fields = ['recipe_count', 'avg_time_minutes', 'min_price',
+                  'max_price', 'avg_price', 'top_tags']
+        read_only_fields = fields
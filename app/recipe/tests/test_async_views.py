@@ -0,0 +1,92 @@
+"""Tests for the async recipe and tag read views"""
+from decimal import Decimal
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import AsyncClient, TestCase, override_settings
+from django.urls import include, path, reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from core.models import Recipe, Tag
+from recipe.urls import async_urlpatterns, router
+
+
+urlpatterns = [
+    path('api/recipe/', include((router.urls, 'recipe'))),
+    path('async/recipe/', include(
+        (async_urlpatterns + router.urls, 'async-recipe'))),
+]
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class AsyncReadViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            'test@example.com', 'testpass123')
+        tags = [Tag.objects.create(user=self.user, name=name)
+                for name in ['thai', 'vegan']]
+        for i in range(3):
+            recipe = Recipe.objects.create(
+                user=self.user, title=f'recipe {i}', time_minutes=i,
+                price=Decimal('4.50'))
+            recipe.tags.add(*tags[:i])
+        auth = f'Token {Token.objects.create(user=self.user).key}'
+        self.client = APIClient(HTTP_AUTHORIZATION=auth)
+        self.async_client = AsyncClient()
+        self.headers = {'Authorization': auth}
+
+    async def assertSameResponse(self, name, params=None, args=None):
+        sync_res = await sync_to_async(self.client.get)(
+            reverse(f'recipe:{name}', args=args), params)
+        async_res = await self.async_client.get(
+            reverse(f'async-recipe:{name}', args=args), params,
+            headers=self.headers)
+
+        self.assertEqual(async_res.status_code, sync_res.status_code)
+        sync_data = sync_res.json()
+        async_data = async_res.json()
+        for data in (sync_data, async_data):
+            if isinstance(data, dict):
+                data.pop('next', None)
+        self.assertEqual(async_data, sync_data)
+
+    async def test_reads_match_sync_views(self):
+        recipe = await Recipe.objects.alatest('id')
+        await self.assertSameResponse('recipe-list')
+        await self.assertSameResponse('recipe-list', {'page_size': 2})
+        await self.assertSameResponse(
+            'recipe-list', {'fields': 'id,tags', 'q': 'recipe'})
+        await self.assertSameResponse('recipe-detail', args=[recipe.id])
+        await self.assertSameResponse('recipe-detail', args=[0])
+        await self.assertSameResponse('tag-list')
+
+    async def test_unauthenticated_rejected(self):
+        res = await AsyncClient().get(reverse('async-recipe:recipe-list'))
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    async def test_conditional_get(self):
+        url = reverse('async-recipe:tag-list')
+        res = await self.async_client.get(url, headers=self.headers)
+
+        res = await self.async_client.get(
+            url, headers={**self.headers, 'If-None-Match': res['ETag']})
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    async def test_writes_use_sync_viewset(self):
+        res = await self.async_client.post(
+            reverse('async-recipe:recipe-list'),
+            {'title': 'new', 'time_minutes': 5, 'price': '1.00'},
+            content_type='application/json', headers=self.headers)
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(await Recipe.objects.filter(title='new').aexists())
+
+    @override_settings(API_FAST_READS=False)
+    async def test_reads_fall_back_without_fast_reads(self):
+        await self.assertSameResponse('recipe-list')
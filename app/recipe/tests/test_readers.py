@@ -0,0 +1,92 @@
+"""Parity tests for the values() based read path"""
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import Prefetch
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from core.models import Recipe, Tag
+from recipe.readers import RecipeReader, TagReader
+from recipe.serializers import (
+    RecipeDetailSerializer, RecipeSerializer, TagSerializer)
+
+
+RECIPES_URL = reverse('recipe:recipe-list')
+TAGS_URL = reverse('recipe:tag-list')
+
+
+class ReaderParityTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            'test@example.com', 'testpass123')
+        tags = [Tag.objects.create(user=self.user, name=name)
+                for name in ['thai', 'vegan', 'quick']]
+        for i, price in enumerate(['5', '0.10', '999.99', '12.5']):
+            recipe = Recipe.objects.create(
+                user=self.user, title=f'recipe {i}', description='d' * i,
+                time_minutes=i, price=Decimal(price),
+                link='http://example.com' if i % 2 else '')
+            recipe.tags.add(*tags[:i])
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def queryset(self):
+        return Recipe.objects.filter(user=self.user).order_by('-id')
+
+    def assertParity(self, serializer_class, reader_class, queryset,
+                     fields=None):
+        context = {'fields': fields}
+        instances = queryset
+        if queryset.model is Recipe:
+            instances = queryset.prefetch_related(
+                Prefetch('tags', queryset=Tag.objects.order_by('id')))
+        expected = serializer_class(
+            instances, many=True, context=context).data
+        reader = reader_class(serializer_class(context=context))
+
+        self.assertEqual(reader.represent(reader.values(queryset)), expected)
+
+    def test_recipe_list_parity(self):
+        self.assertParity(RecipeSerializer, RecipeReader, self.queryset())
+
+    def test_recipe_detail_parity(self):
+        self.assertParity(
+            RecipeDetailSerializer, RecipeReader, self.queryset())
+
+    def test_sparse_fields_parity(self):
+        for fields in [{'id', 'title'}, {'price', 'tags'}, {'tags'}]:
+            with self.subTest(fields=fields):
+                self.assertParity(RecipeDetailSerializer, RecipeReader,
+                                  self.queryset(), fields)
+
+    def test_tag_parity(self):
+        self.assertParity(TagSerializer, TagReader,
+                          Tag.objects.filter(user=self.user).order_by('-name'))
+
+    def test_api_responses_match_serializer_path(self):
+        recipe = Recipe.objects.filter(user=self.user).last()
+        requests = [
+            (RECIPES_URL, {}),
+            (RECIPES_URL, {'page_size': 2, 'omit': 'link'}),
+            (RECIPES_URL, {'q': 'recipe', 'tags': recipe.tags.first().id}),
+            (reverse('recipe:recipe-detail', args=[recipe.id]), {}),
+            (TAGS_URL, {}),
+        ]
+        for url, params in requests:
+            with self.subTest(url=url, params=params):
+                cache.clear()
+                fast = self.client.get(url, params)
+                cache.clear()
+                with override_settings(API_FAST_READS=False):
+                    slow = self.client.get(url, params)
+                self.assertEqual(fast.status_code, 200)
+                self.assertEqual(fast.content, slow.content)
+
+    def test_missing_recipe_not_found(self):
+        res = self.client.get(reverse('recipe:recipe-detail', args=[0]))
+
+        self.assertEqual(res.status_code, 404)
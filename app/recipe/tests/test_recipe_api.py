@@ -1,17 +1,32 @@
+import csv
+import json
+from base64 import urlsafe_b64encode
 from decimal import Decimal
+from unittest.mock import patch
+
+from asgiref.sync import sync_to_async
 
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection, transaction
 
-from django.test import TestCase
+from django.test import AsyncClient, TestCase
+from django.test.utils import CaptureQueriesContext
 
 from django.urls import reverse
 from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.permissions import BasePermission, IsAuthenticated
 from rest_framework.test import APIClient
 from core.models import Recipe, Tag
 
+from recipe.export import aiter_recipes, iter_recipes
 from recipe.serializers import RecipeSerializer, RecipeDetailSerializer
+from recipe.views import RecipeViewSet
 
 RECIPES_URL = reverse('recipe:recipe-list')
+BULK_URL = reverse('recipe:recipe-bulk')
+EXPORT_URL = reverse('recipe:recipe-export')
 
 
 def create_recipe(user, **kwargs):
@@ -44,6 +59,7 @@ class PublicRecipeAPITest(TestCase):
 
 class PrivateRecipeAPITest(TestCase):
     def setUp(self):
+        cache.clear()
         self.user = get_user_model().objects.create_user(
             'test@example.com', 'testpassword')
         self.client = APIClient()
@@ -58,7 +74,7 @@ class PrivateRecipeAPITest(TestCase):
         recipes = Recipe.objects.all().order_by('-id')
         serializer = RecipeSerializer(recipes, many=True)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data['results'], serializer.data)
 
     def test_recipe_list_limited_to_user(self):
         other_user = get_user_model().objects.create_user(
@@ -70,7 +86,7 @@ class PrivateRecipeAPITest(TestCase):
         recipes = Recipe.objects.filter(user=self.user)
         serializer = RecipeSerializer(recipes, many=True)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data['results'], serializer.data)
 
     def test_single_recipe_view(self):
         recipe = create_recipe(user=self.user)
@@ -160,3 +176,540 @@ class PrivateRecipeAPITest(TestCase):
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertIn(thai_tag, recipe.tags.all())
         self.assertNotIn(breakfast_tag, recipe.tags.all())
+
+    def test_list_query_count_fixed(self):
+        tag = Tag.objects.create(user=self.user, name='vegan')
+        for _ in range(2):
+            create_recipe(user=self.user).tags.add(tag)
+        with self.assertNumQueries(2):
+            self.client.get(RECIPES_URL)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            for _ in range(20):
+                create_recipe(user=self.user).tags.add(tag)
+        with self.assertNumQueries(2):
+            res = self.client.get(RECIPES_URL)
+        self.assertEqual(len(res.data['results']), 22)
+
+    def test_detail_query_count_fixed(self):
+        recipe = create_recipe(user=self.user)
+        for name in ['thai', 'dinner', 'spicy']:
+            recipe.tags.add(Tag.objects.create(user=self.user, name=name))
+        with self.assertNumQueries(2):
+            res = self.client.get(detail_url(recipe.id))
+        self.assertEqual(len(res.data['tags']), 3)
+
+    def test_detail_non_numeric_pk_not_found(self):
+        for fast_reads in (True, False):
+            with self.subTest(fast_reads=fast_reads), self.settings(
+                    API_FAST_READS=fast_reads):
+                res = self.client.get(detail_url('abc'))
+
+                self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_detail_checks_object_permissions(self):
+        class DenyObjects(BasePermission):
+            def has_object_permission(self, request, view, obj):
+                return False
+
+        recipe = create_recipe(user=self.user)
+        with patch.object(RecipeViewSet, 'permission_classes',
+                          [IsAuthenticated, DenyObjects]):
+            res = self.client.get(detail_url(recipe.id))
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_create_recipe_tag_query_count_fixed(self):
+        def payload(count):
+            return {
+                'title': 'thai curry',
+                'time_minutes': 30,
+                'price': Decimal('2.50'),
+                'tags': [{'name': f'tag{i}'} for i in range(count)]
+            }
+
+        with CaptureQueriesContext(connection) as few:
+            self.client.post(RECIPES_URL, payload(3), format='json')
+        with CaptureQueriesContext(connection) as many:
+            res = self.client.post(RECIPES_URL, payload(30), format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(few), len(many))
+        self.assertEqual(Tag.objects.filter(user=self.user).count(), 30)
+
+    def test_update_tags_writes_only_diff(self):
+        keep = Tag.objects.create(user=self.user, name='keep')
+        drop = Tag.objects.create(user=self.user, name='drop')
+        recipe = create_recipe(user=self.user)
+        recipe.tags.add(keep, drop)
+        through = Recipe.tags.through
+        kept_row = through.objects.get(recipe=recipe, tag=keep)
+        payload = {'tags': [{'name': 'keep'}, {'name': 'new'}, {'name': 'new'}]}
+
+        res = self.client.patch(detail_url(recipe.id), payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(through.objects.filter(pk=kept_row.pk).exists())
+        self.assertEqual(
+            sorted(recipe.tags.values_list('name', flat=True)), ['keep', 'new'])
+
+    def test_list_paginated_by_cursor(self):
+        recipes = [create_recipe(user=self.user, title=f'r{i}') for i in range(7)]
+        ids = []
+        url = RECIPES_URL + '?page_size=3'
+        while url:
+            with CaptureQueriesContext(connection) as queries:
+                res = self.client.get(url)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertEqual(len(queries), 2)
+            for query in queries:
+                self.assertNotIn('OFFSET', query['sql'].upper())
+            ids += [item['id'] for item in res.data['results']]
+            url = res.data['next']
+
+        self.assertEqual(ids, [recipe.id for recipe in reversed(recipes)])
+
+    def test_list_not_modified_with_etag(self):
+        create_recipe(user=self.user)
+        res = self.client.get(RECIPES_URL)
+        etag = res['ETag']
+
+        with self.assertNumQueries(0):
+            res = self.client.get(RECIPES_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res['ETag'], etag)
+
+    def test_list_body_served_from_cache(self):
+        create_recipe(user=self.user)
+        first = self.client.get(RECIPES_URL)
+
+        with self.assertNumQueries(0):
+            res = self.client.get(RECIPES_URL)
+
+        self.assertEqual(res.data, first.data)
+
+    def test_list_etag_changes_on_write(self):
+        recipe = create_recipe(user=self.user)
+        etags = [self.client.get(RECIPES_URL)['ETag']]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            recipe.tags.add(Tag.objects.create(user=self.user, name='thai'))
+        etags.append(self.client.get(RECIPES_URL)['ETag'])
+        with self.captureOnCommitCallbacks(execute=True):
+            recipe.tags.clear()
+        etags.append(self.client.get(RECIPES_URL)['ETag'])
+        with self.captureOnCommitCallbacks(execute=True):
+            recipe.delete()
+        res = self.client.get(RECIPES_URL, HTTP_IF_NONE_MATCH=etags[-1])
+        etags.append(res['ETag'])
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['results'], [])
+        self.assertEqual(len(set(etags)), 4)
+
+    def test_list_version_bumped_on_commit(self):
+        etag = self.client.get(RECIPES_URL)['ETag']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                create_recipe(user=self.user)
+                # A read racing the open transaction must not see a new
+                # version, or it would cache the old rows under it.
+                self.assertEqual(self.client.get(RECIPES_URL)['ETag'], etag)
+
+        res = self.client.get(RECIPES_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data['results']), 1)
+
+    def test_list_etag_depends_on_query_params(self):
+        create_recipe(user=self.user)
+        res = self.client.get(RECIPES_URL)
+
+        res = self.client.get(
+            RECIPES_URL, {'page_size': 1}, HTTP_IF_NONE_MATCH=res['ETag'])
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+
+class BulkRecipeAPITest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            'test@example.com', 'testpassword')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def payload(self, count, tags=('thai', 'dinner')):
+        return [{
+            'title': f'recipe {i}',
+            'time_minutes': i,
+            'price': '2.50',
+            'tags': [{'name': name} for name in tags]
+        } for i in range(count)]
+
+    def test_bulk_create(self):
+        res = self.client.post(BULK_URL, self.payload(3), format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        recipes = Recipe.objects.filter(user=self.user).order_by('id')
+        self.assertEqual([recipe.id for recipe in recipes], res.data['ids'])
+        self.assertEqual(Tag.objects.filter(user=self.user).count(), 2)
+        for recipe in recipes:
+            self.assertEqual(recipe.tags.count(), 2)
+
+    def test_bulk_create_query_count_fixed(self):
+        with CaptureQueriesContext(connection) as few:
+            self.client.post(BULK_URL, self.payload(5, ('a', 'b')), format='json')
+        with CaptureQueriesContext(connection) as many:
+            self.client.post(BULK_URL, self.payload(50, ('c', 'd')), format='json')
+
+        self.assertEqual(len(few), len(many))
+
+    def test_bulk_create_reports_item_errors(self):
+        payload = self.payload(3)
+        del payload[1]['title']
+
+        res = self.client.post(BULK_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data[0], {})
+        self.assertIn('title', res.data[1])
+        self.assertFalse(Recipe.objects.exists())
+
+    def test_bulk_update(self):
+        keep = create_recipe(user=self.user)
+        change = create_recipe(user=self.user)
+        thai = Tag.objects.create(user=self.user, name='thai')
+        keep.tags.add(thai)
+        change.tags.add(thai)
+        payload = [
+            {'id': keep.id, 'title': 'kept'},
+            {'id': change.id, 'tags': [{'name': 'dinner'}]},
+        ]
+
+        res = self.client.patch(BULK_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        keep.refresh_from_db()
+        self.assertEqual(keep.title, 'kept')
+        self.assertEqual(list(keep.tags.all()), [thai])
+        self.assertEqual(
+            list(change.tags.values_list('name', flat=True)), ['dinner'])
+
+    def test_bulk_update_other_users_recipe(self):
+        other = get_user_model().objects.create_user(
+            'other@example.com', 'testpassword')
+        recipe = create_recipe(user=other)
+
+        res = self.client.patch(
+            BULK_URL, [{'id': recipe.id, 'title': 'mine'}], format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('id', res.data[0])
+
+    def test_bulk_delete(self):
+        other = get_user_model().objects.create_user(
+            'other@example.com', 'testpassword')
+        mine = [create_recipe(user=self.user) for _ in range(3)]
+        theirs = create_recipe(user=other)
+        ids = [mine[0].id, mine[1].id, theirs.id]
+
+        res = self.client.delete(BULK_URL, {'ids': ids}, format='json')
+
+        self.assertEqual(res.data, {'deleted': 2})
+        self.assertTrue(Recipe.objects.filter(id=theirs.id).exists())
+        self.assertTrue(Recipe.objects.filter(id=mine[2].id).exists())
+
+    def test_bulk_create_invalidates_list_cache(self):
+        etag = self.client.get(RECIPES_URL)['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(BULK_URL, self.payload(2), format='json')
+
+        res = self.client.get(RECIPES_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(len(res.data['results']), 2)
+
+
+class ExportRecipeAPITest(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            'test@example.com', 'testpassword')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_export_ndjson(self):
+        recipe = create_recipe(user=self.user, title='curry')
+        recipe.tags.add(Tag.objects.create(user=self.user, name='thai'))
+        other = get_user_model().objects.create_user(
+            'other@example.com', 'testpassword')
+        create_recipe(user=other)
+
+        res = self.client.get(EXPORT_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in
+                b''.join(res.streaming_content).decode().splitlines()]
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['title'], 'curry')
+        self.assertEqual(rows[0]['price'], '5.25')
+        self.assertEqual(rows[0]['tags'], ['thai'])
+
+    def test_export_csv(self):
+        recipe = create_recipe(user=self.user, title='curry')
+        recipe.tags.add(Tag.objects.create(user=self.user, name='thai'),
+                        Tag.objects.create(user=self.user, name='dinner'))
+
+        res = self.client.get(EXPORT_URL, {'output': 'csv'})
+
+        rows = list(csv.DictReader(
+            b''.join(res.streaming_content).decode().splitlines()))
+        self.assertEqual(rows[0]['title'], 'curry')
+        self.assertEqual(rows[0]['tags'], 'dinner|thai')
+
+    def test_export_unknown_output(self):
+        res = self.client.get(EXPORT_URL, {'output': 'xml'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_fetches_tags_per_chunk(self):
+        tag = Tag.objects.create(user=self.user, name='thai')
+        for _ in range(5):
+            create_recipe(user=self.user).tags.add(tag)
+
+        with self.assertNumQueries(4):
+            rows = list(iter_recipes(self.user, chunk_size=2))
+
+        self.assertEqual(len(rows), 5)
+        self.assertTrue(all(row['tags'] == ['thai'] for row in rows))
+
+    async def test_export_streams_async_under_asgi(self):
+        tag = await Tag.objects.acreate(user=self.user, name='thai')
+        for i in range(5):
+            recipe = await Recipe.objects.acreate(
+                user=self.user, title=f'r{i}', time_minutes=i,
+                price=Decimal('1.50'))
+            await recipe.tags.aadd(tag)
+        token = await Token.objects.acreate(user=self.user)
+
+        res = await AsyncClient().get(
+            EXPORT_URL, {'output': 'csv'},
+            headers={'Authorization': f'Token {token.key}'})
+
+        self.assertTrue(res.is_async)
+        body = b''.join([chunk async for chunk in res.streaming_content])
+        rows = list(csv.DictReader(body.decode().splitlines()))
+        self.assertEqual([row['title'] for row in rows],
+                         [f'r{i}' for i in range(5)])
+        self.assertEqual(
+            [row async for row in aiter_recipes(self.user, chunk_size=2)],
+            await sync_to_async(list)(iter_recipes(self.user)))
+
+
+class SearchRecipeAPITest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            'test@example.com', 'testpassword')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def search(self, query, **params):
+        res = self.client.get(RECIPES_URL, {'q': query, **params})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return res
+
+    def test_search_title_and_description(self):
+        by_title = create_recipe(user=self.user, title='Thai curry',
+                                 description='rice')
+        by_description = create_recipe(user=self.user, title='Dinner',
+                                       description='a mild curry')
+        create_recipe(user=self.user, title='Toast', description='bread')
+
+        res = self.search('curry')
+
+        self.assertEqual([item['id'] for item in res.data['results']],
+                         [by_title.id, by_description.id])
+
+    def test_search_prefix_and_all_terms(self):
+        both = create_recipe(user=self.user, title='Green curry',
+                             description='spicy')
+        create_recipe(user=self.user, title='Red curry', description='mild')
+
+        res = self.search('cur spic')
+
+        self.assertEqual([item['id'] for item in res.data['results']],
+                         [both.id])
+
+    def test_search_limited_to_user(self):
+        other = get_user_model().objects.create_user(
+            'other@example.com', 'testpassword')
+        create_recipe(user=other, title='Curry')
+
+        res = self.search('curry')
+
+        self.assertEqual(res.data['results'], [])
+
+    def test_search_paginates_by_rank(self):
+        for i in range(3):
+            create_recipe(user=self.user, title='Curry', description=f'{i}')
+            create_recipe(user=self.user, title='Dinner',
+                          description='curry')
+        ids = []
+        res = self.search('curry', page_size=2)
+        while True:
+            ids += [item['id'] for item in res.data['results']]
+            if not res.data['next']:
+                break
+            res = self.client.get(res.data['next'])
+
+        titles = [Recipe.objects.get(id=pk).title for pk in ids]
+        self.assertEqual(len(set(ids)), 6)
+        self.assertEqual(titles, ['Curry'] * 3 + ['Dinner'] * 3)
+
+    def test_search_pages_through_equal_ranks_without_offset(self):
+        ids = sorted(
+            (create_recipe(user=self.user, title='Curry').id
+             for _ in range(7)), reverse=True)
+        seen = []
+        with CaptureQueriesContext(connection) as queries:
+            res = self.search('curry', page_size=2)
+            while True:
+                seen += [item['id'] for item in res.data['results']]
+                self.assertIsNone(res.data['previous'])
+                if not res.data['next']:
+                    break
+                res = self.client.get(res.data['next'])
+
+        self.assertEqual(seen, ids)
+        for query in queries:
+            self.assertNotIn('OFFSET', query['sql'])
+
+    def test_search_invalid_cursor(self):
+        res = self.client.get(RECIPES_URL, {'q': 'curry', 'cursor': 'nope'})
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_search_malformed_cursor_values(self):
+        create_recipe(user=self.user, title='Curry')
+        for key in (['x', 'y'], [{'a': 1}, 1], [1.0, 'abc'], [None, None],
+                    [1.0, 2 ** 70]):
+            with self.subTest(key=key):
+                cursor = urlsafe_b64encode(json.dumps(key).encode()).decode()
+
+                res = self.client.get(
+                    RECIPES_URL, {'q': 'curry', 'cursor': cursor})
+
+                self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_blank_search_lists_everything(self):
+        create_recipe(user=self.user)
+
+        res = self.search('!!')
+
+        self.assertEqual(len(res.data['results']), 1)
+
+
+class FilterRecipeAPITest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            'test@example.com', 'testpassword')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.thai = Tag.objects.create(user=self.user, name='thai')
+        self.vegan = Tag.objects.create(user=self.user, name='vegan')
+        self.curry = create_recipe(user=self.user, price=Decimal('8.00'),
+                                   time_minutes=40)
+        self.curry.tags.add(self.thai, self.vegan)
+        self.noodles = create_recipe(user=self.user, price=Decimal('4.00'),
+                                     time_minutes=15)
+        self.noodles.tags.add(self.thai)
+        self.toast = create_recipe(user=self.user, price=Decimal('1.00'),
+                                   time_minutes=5)
+
+    def ids(self, **params):
+        res = self.client.get(RECIPES_URL, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [item['id'] for item in res.data['results']]
+
+    def test_filter_tags_any(self):
+        self.assertEqual(
+            self.ids(tags=f'{self.thai.id},{self.vegan.id}'),
+            [self.noodles.id, self.curry.id])
+
+    def test_filter_tags_all(self):
+        self.assertEqual(
+            self.ids(tags=f'{self.thai.id},{self.vegan.id}', tags_match='all'),
+            [self.curry.id])
+
+    def test_filter_max_price_and_time(self):
+        self.assertEqual(self.ids(max_price='4.00'),
+                         [self.toast.id, self.noodles.id])
+        self.assertEqual(self.ids(max_time=10), [self.toast.id])
+        self.assertEqual(self.ids(tags=self.thai.id, max_price='5'),
+                         [self.noodles.id])
+
+    def test_filter_invalid_params(self):
+        for params in [{'tags': 'thai'}, {'max_price': 'cheap'},
+                       {'tags': '1', 'tags_match': 'some'}]:
+            res = self.client.get(RECIPES_URL, params)
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_filter_out_of_range_numbers(self):
+        for params in [{'max_price': '1000'}, {'max_price': 'NaN'},
+                       {'max_price': '1e400'}, {'max_price': '1.005'},
+                       {'max_time': '99999999999999999999'},
+                       {'max_time': '-1'}]:
+            with self.subTest(**params):
+                res = self.client.get(RECIPES_URL, params)
+
+                self.assertEqual(
+                    res.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertIn(next(iter(params)), res.data)
+
+
+class SparseFieldsRecipeAPITest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            'test@example.com', 'testpassword')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.recipe = create_recipe(user=self.user, description='x' * 500)
+        self.recipe.tags.add(Tag.objects.create(user=self.user, name='thai'))
+
+    def test_list_selected_fields(self):
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(RECIPES_URL, {'fields': 'id,title'})
+
+        self.assertEqual(res.data['results'],
+                         [{'id': self.recipe.id, 'title': self.recipe.title}])
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('"price"', queries[0]['sql'])
+
+    def test_list_omit_tags_skips_prefetch(self):
+        full = self.client.get(RECIPES_URL)
+        with self.assertNumQueries(1):
+            res = self.client.get(RECIPES_URL, {'omit': 'tags'})
+
+        self.assertNotIn('tags', res.data['results'][0])
+        self.assertIn('price', res.data['results'][0])
+        self.assertLess(len(res.content), len(full.content))
+
+    def test_detail_omit_description(self):
+        url = detail_url(self.recipe.id)
+        full = self.client.get(url)
+
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(url, {'omit': 'description'})
+
+        self.assertNotIn('description', res.data)
+        self.assertEqual(res.data['tags'], full.data['tags'])
+        self.assertNotIn('description', queries[0]['sql'])
+        self.assertLess(len(res.content) + 500, len(full.content))
+
+    def test_unknown_field(self):
+        res = self.client.get(RECIPES_URL, {'fields': 'id,secret'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,188 @@
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core import stats
+from core.models import Recipe, RecipeStats, Tag, TagStats
+from core.routers import replica_reads
+
+
+STATS_URL = reverse('recipe:stats')
+RECIPES_URL = reverse('recipe:recipe-list')
+BULK_URL = reverse('recipe:recipe-bulk')
+
+
+def create_recipe(user, **kwargs):
+    default = {
+        'user': user,
+        'title': 'recipe_title',
+        'time_minutes': 10,
+        'price': Decimal('5.00'),
+    }
+    default.update(**kwargs)
+    return Recipe.objects.create(**default)
+
+
+class PublicStatsAPITest(TestCase):
+    def test_auth_required(self):
+        res = APIClient().get(STATS_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class RecipeStatsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            'test@example.com', 'testpassword')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def snapshot(self):
+        summary = RecipeStats.objects.get(user=self.user)
+        tags = dict(TagStats.objects.filter(
+            user=self.user, recipe_count__gt=0).values_list(
+            'tag_id', 'recipe_count'))
+        return (summary.recipe_count, summary.total_time_minutes,
+                summary.total_price, summary.min_price, summary.max_price,
+                tags)
+
+    def assertConsistent(self):
+        """The incremental rows match a rebuild from scratch."""
+        incremental = self.snapshot()
+        stats.rebuild_user(self.user.id)
+        self.assertEqual(incremental, self.snapshot())
+
+    def test_stats_read(self):
+        thai = Tag.objects.create(user=self.user, name='thai')
+        vegan = Tag.objects.create(user=self.user, name='vegan')
+        create_recipe(self.user, time_minutes=10, price=Decimal('4.00'))
+        create_recipe(self.user, time_minutes=20,
+                      price=Decimal('6.50')).tags.add(thai, vegan)
+        create_recipe(self.user, time_minutes=30,
+                      price=Decimal('2.00')).tags.add(thai)
+        other = get_user_model().objects.create_user(
+            'other@example.com', 'testpassword')
+        create_recipe(other, price=Decimal('99.00'))
+
+        with self.assertNumQueries(2):
+            res = self.client.get(STATS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['recipe_count'], 3)
+        self.assertEqual(res.data['avg_time_minutes'], 20)
+        self.assertEqual(res.data['min_price'], '2.00')
+        self.assertEqual(res.data['max_price'], '6.50')
+        self.assertEqual(res.data['avg_price'], '4.17')
+        self.assertEqual(
+            [(tag['name'], tag['recipe_count'])
+             for tag in res.data['top_tags']],
+            [('thai', 2), ('vegan', 1)])
+
+    def test_stats_empty(self):
+        res = self.client.get(STATS_URL)
+
+        self.assertEqual(res.data['recipe_count'], 0)
+        self.assertIsNone(res.data['avg_time_minutes'])
+        self.assertIsNone(res.data['min_price'])
+        self.assertEqual(res.data['top_tags'], [])
+
+    def test_stats_built_when_missing(self):
+        create_recipe(self.user, price=Decimal('3.00'))
+        RecipeStats.objects.all().delete()
+
+        res = self.client.get(STATS_URL)
+
+        self.assertEqual(res.data['recipe_count'], 1)
+        self.assertEqual(res.data['max_price'], '3.00')
+
+    def test_rebuild_reads_primary_during_replica_reads(self):
+        create_recipe(self.user, price=Decimal('3.00'))
+        RecipeStats.objects.all().delete()
+        token = replica_reads.set(True)
+        self.addCleanup(replica_reads.reset, token)
+
+        # Any read routed to the (missing) replica would raise here.
+        with patch('core.routers.choose_replica',
+                   return_value='missing-replica'):
+            summary = stats.rebuild_user(self.user.id)
+
+        self.assertEqual(summary.recipe_count, 1)
+
+    def test_stats_follow_updates(self):
+        cheap = create_recipe(self.user, price=Decimal('1.00'))
+        pricey = create_recipe(self.user, price=Decimal('9.00'))
+
+        pricey.price = Decimal('5.00')
+        pricey.time_minutes = 45
+        pricey.save()
+        cheap.title = 'renamed'
+        cheap.save(update_fields=['title'])
+        self.assertEqual(
+            RecipeStats.objects.get(user=self.user).max_price,
+            Decimal('5.00'))
+        self.assertConsistent()
+
+        cheap.delete()
+        self.assertEqual(
+            RecipeStats.objects.get(user=self.user).min_price,
+            Decimal('5.00'))
+        self.assertConsistent()
+
+    def test_stats_follow_tagging(self):
+        tags = [Tag.objects.create(user=self.user, name=name)
+                for name in ('a', 'b', 'c')]
+        first = create_recipe(self.user)
+        second = create_recipe(self.user)
+        first.tags.add(*tags)
+        second.tags.add(tags[0])
+        first.tags.remove(tags[1], tags[1])
+        second.tags.remove(tags[2])
+        tags[0].recipe_set.add(second)
+        self.assertConsistent()
+
+        tags[2].recipe_set.clear()
+        first.tags.clear()
+        self.assertConsistent()
+
+        second.tags.add(tags[1])
+        second.delete()
+        tags[0].delete()
+        self.assertConsistent()
+
+    def test_stats_follow_api_writes(self):
+        res = self.client.post(RECIPES_URL, {
+            'title': 'curry', 'time_minutes': 30, 'price': '7.25',
+            'tags': [{'name': 'thai'}, {'name': 'dinner'}],
+        }, format='json')
+        self.client.patch(
+            reverse('recipe:recipe-detail', args=[res.data['id']]),
+            {'price': '8.00', 'tags': [{'name': 'thai'}]}, format='json')
+        self.assertConsistent()
+
+        res = self.client.post(BULK_URL, [
+            {'title': f'r{i}', 'time_minutes': i, 'price': f'{i}.50',
+             'tags': [{'name': 'bulk'}]}
+            for i in range(1, 4)
+        ], format='json')
+        self.assertConsistent()
+
+        self.client.delete(
+            BULK_URL, {'ids': res.data['ids'][:2]}, format='json')
+        self.assertEqual(
+            RecipeStats.objects.get(user=self.user).recipe_count, 2)
+        self.assertConsistent()
+
+    def test_user_delete_cascades(self):
+        create_recipe(self.user).tags.add(
+            Tag.objects.create(user=self.user, name='a'))
+
+        self.user.delete()
+
+        self.assertFalse(RecipeStats.objects.exists())
+        self.assertFalse(TagStats.objects.exists())
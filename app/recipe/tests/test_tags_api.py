@@ -1,9 +1,13 @@
+from decimal import Decimal
+
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
+from django.db import IntegrityError
 from django.test import TestCase
-from core.models import Tag
+from core.models import Recipe, Tag
 
 from recipe.serializers import TagSerializer
 
@@ -33,6 +37,7 @@ class PublicTagsAPIRequest(TestCase):
 class PrivateTagsAPIRequest(TestCase):
 
     def setUp(self):
+        cache.clear()
         self.user = create_user()
         self.client = APIClient()
         self.client.force_authenticate(self.user)
@@ -44,14 +49,14 @@ class PrivateTagsAPIRequest(TestCase):
         res = self.client.get(TAG_URL)
         serializar = TagSerializer(tags, many=True)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializar.data)
+        self.assertEqual(res.data['results'], serializar.data)
 
     def test_user_limited_results(self):
         user2 = create_user(email='test2@example.com', password='testing')
         Tag.objects.create(user=self.user, name='Vegan')
         Tag.objects.create(user=user2, name='Desert')
         res = self.client.get(TAG_URL)
-        self.assertEqual(len(res.data), 1)
+        self.assertEqual(len(res.data['results']), 1)
 
     def test_update_tag(self):
         tag = Tag.objects.create(user=self.user, name='Vegan')
@@ -67,3 +72,72 @@ class PrivateTagsAPIRequest(TestCase):
         self.client.delete(create_tag_url(tag.id))
         tags = Tag.objects.filter(user=self.user)
         self.assertFalse(tags.exists())
+
+    def test_tags_paginated_by_cursor(self):
+        for name in ['a', 'b', 'c']:
+            Tag.objects.create(user=self.user, name=name)
+        res = self.client.get(TAG_URL, {'page_size': 2})
+        self.assertEqual(
+            [tag['name'] for tag in res.data['results']], ['c', 'b'])
+
+        res = self.client.get(res.data['next'])
+        self.assertEqual([tag['name'] for tag in res.data['results']], ['a'])
+        self.assertIsNone(res.data['next'])
+
+    def test_tag_name_unique_per_user(self):
+        Tag.objects.create(user=self.user, name='Vegan')
+        Tag.objects.create(user=create_user(email='other@example.com'), name='Vegan')
+
+        with self.assertRaises(IntegrityError):
+            Tag.objects.create(user=self.user, name='Vegan')
+
+    def test_rename_to_existing_tag_rejected(self):
+        Tag.objects.create(user=self.user, name='Vegan')
+        tag = Tag.objects.create(user=self.user, name='Desert')
+
+        res = self.client.patch(create_tag_url(tag.id), {'name': 'Vegan'})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('name', res.data)
+
+        res = self.client.patch(create_tag_url(tag.id), {'name': 'Desert'})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_tag_list_etag_changes_on_update(self):
+        tag = Tag.objects.create(user=self.user, name='Vegan')
+        etag = self.client.get(TAG_URL)['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(create_tag_url(tag.id), {'name': 'Desert'})
+
+        res = self.client.get(TAG_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['results'][0]['name'], 'Desert')
+
+    def test_filter_assigned_only(self):
+        used = Tag.objects.create(user=self.user, name='Vegan')
+        Tag.objects.create(user=self.user, name='Desert')
+        for _ in range(2):
+            Recipe.objects.create(
+                user=self.user, title='curry', time_minutes=5,
+                price=Decimal('2.00')).tags.add(used)
+
+        res = self.client.get(TAG_URL, {'assigned_only': 1})
+
+        self.assertEqual(
+            [tag['id'] for tag in res.data['results']], [used.id])
+
+    def test_filter_assigned_only_flag_values(self):
+        used = Tag.objects.create(user=self.user, name='Vegan')
+        Tag.objects.create(user=self.user, name='Desert')
+        Recipe.objects.create(
+            user=self.user, title='curry', time_minutes=5,
+            price=Decimal('2.00')).tags.add(used)
+
+        for value, count in (('true', 1), ('0', 2), ('false', 2)):
+            with self.subTest(value=value):
+                res = self.client.get(TAG_URL, {'assigned_only': value})
+
+                self.assertEqual(res.status_code, status.HTTP_200_OK)
+                self.assertEqual(len(res.data['results']), count)
+        res = self.client.get(TAG_URL, {'assigned_only': '7'})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
@@ -1,5 +1,4 @@
-
-
+from django.conf import settings
 from django.urls import (path, include)
 
 from rest_framework.routers import DefaultRouter
@@ -12,4 +11,23 @@ router.register('recipes', views.RecipeViewSet)
 router.register('tags', views.TagViewSet)
 app_name = 'recipe'
 
-urlpatterns = [path('', include(router.urls))]
+async_urlpatterns = [
+    path('recipes/', views.AsyncReadView.as_view(
+        viewset=views.RecipeViewSet, basename='recipe', detail=False,
+        actions={'get': 'list', 'post': 'create'}), name='recipe-list'),
+    path('recipes/<int:pk>/', views.AsyncReadView.as_view(
+        viewset=views.RecipeViewSet, basename='recipe', detail=True,
+        actions={'get': 'retrieve', 'put': 'update',
+                 'patch': 'partial_update', 'delete': 'destroy'}),
+         name='recipe-detail'),
+    path('tags/', views.AsyncReadView.as_view(
+        viewset=views.TagViewSet, basename='tag', detail=False,
+        actions={'get': 'list'}), name='tag-list'),
+]
+
+urlpatterns = [
+    path('stats/', views.RecipeStatsView.as_view(), name='stats'),
+    path('', include(router.urls)),
+]
+if settings.API_ASYNC_READS:
+    urlpatterns = async_urlpatterns + urlpatterns
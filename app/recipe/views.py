@@ -1,20 +1,78 @@
-from rest_framework import viewsets, mixins
-from rest_framework.authentication import TokenAuthentication
+from collections import Counter
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import Prefetch
+from django.http import StreamingHttpResponse
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import generics, viewsets, mixins, status
+from rest_framework.exceptions import ValidationError
+from rest_framework.decorators import action
+from rest_framework.response import Response
 
 from rest_framework.permissions import IsAuthenticated
 
+from core import stats
+from core.authentication import CachedTokenAuthentication
+from core.mixins import ReplicaReadMixin
 from core.models import Recipe, Tag
-from recipe import serializers
+from core.pagination import KeysetPagination, NameKeysetPagination
+from core.signals import recipes_bulk_changed
+from core.throttling import RecipeWriteThrottle
+from recipe import export, filters, readers, search, serializers
+from recipe.mixins import ConditionalListMixin, FastReadMixin
 
 
-class RecipeViewSet(viewsets.ModelViewSet):
+class RecipeViewSet(ReplicaReadMixin, ConditionalListMixin, FastReadMixin, viewsets.ModelViewSet):
     serializer_class = serializers.RecipeDetailSerializer
+    reader_class = readers.RecipeReader
     queryset = Recipe.objects.all()
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    throttle_classes = [RecipeWriteThrottle]
+
+    def get_sparse_fields(self):
+        """Fields picked with ?fields= / ?omit= on reads, or None for all."""
+        params = self.request.query_params
+        if self.action not in ('list', 'retrieve') or not (
+                params.get('fields') or params.get('omit')):
+            return None
+        available = set(self.get_serializer_class().Meta.fields)
+        fields = set(params.get('fields', '').split(',')) - {''} or available
+        omit = set(params.get('omit', '').split(',')) - {''}
+        unknown = (fields | omit) - available
+        if unknown:
+            raise ValidationError(
+                {'fields': [f'Unknown fields: {", ".join(sorted(unknown))}.']})
+        return fields - omit
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['fields'] = self.get_sparse_fields()
+        return context
 
     def get_queryset(self):
-        return self.queryset.filter(user=self.request.user).order_by('-id')
+        queryset = self.queryset.filter(user=self.request.user)
+        fields = self.get_sparse_fields()
+        tags = Prefetch('tags', queryset=Tag.objects.order_by('id'))
+        if fields is None:
+            queryset = queryset.prefetch_related(tags)
+            if self.action == 'list':
+                queryset = queryset.defer('description')
+        else:
+            if 'tags' in fields:
+                queryset = queryset.prefetch_related(tags)
+            queryset = queryset.only('id', *(fields - {'tags'}))
+        queryset = queryset.order_by('-id')
+        if self.action == 'list':
+            params = self.request.query_params
+            queryset = filters.filter_recipes(queryset, params)
+            if params.get('q'):
+                queryset = search.search_recipes(queryset, params['q'])
+        return queryset
 
     def get_serializer_class(self):
         if self.action == 'list':
@@ -24,12 +82,142 @@ class RecipeViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
+    @action(detail=False, methods=['post', 'patch', 'delete'], url_path='bulk')
+    def bulk(self, request):
+        """Create, update or delete many recipes in one request."""
+        if request.method == 'DELETE':
+            serializer = serializers.RecipeBulkDeleteSerializer(
+                data=request.data)
+            serializer.is_valid(raise_exception=True)
+            # One rebuild afterwards beats per-row stats updates.
+            with stats.suspend_updates():
+                _, deleted = Recipe.objects.filter(
+                    user=request.user, id__in=serializer.validated_data['ids']
+                ).delete()
+            recipes_bulk_changed.send(sender=Recipe, user=request.user)
+            return Response({'deleted': deleted.get(Recipe._meta.label, 0)})
+
+        instances = None
+        if request.method == 'PATCH' and isinstance(request.data, list):
+            ids = [
+                item.get('id') if isinstance(item, dict) else None
+                for item in request.data
+            ]
+            counts = Counter(ids)
+            found = Recipe.objects.filter(user=request.user).in_bulk(
+                [pk for pk in counts if isinstance(pk, int)])
+            errors = [
+                {} if pk in found and counts[pk] == 1
+                else {'id': ['Unknown or duplicate recipe id.']}
+                for pk in ids
+            ]
+            if any(errors):
+                return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+            instances = [found[pk] for pk in ids]
 
-class TagViewSet(mixins.ListModelMixin, viewsets.GenericViewSet, mixins.UpdateModelMixin, mixins.DestroyModelMixin):
+        serializer = self.get_serializer(
+            instances,
+            data=request.data,
+            many=True,
+            partial=request.method == 'PATCH',
+            allow_empty=False,
+            max_length=settings.RECIPE_BULK_MAX_ITEMS
+        )
+        serializer.is_valid(raise_exception=True)
+        if instances is None:
+            recipes = serializer.save(user=request.user)
+            response_status = status.HTTP_201_CREATED
+        else:
+            recipes = serializer.save()
+            response_status = status.HTTP_200_OK
+        return Response(
+            {'ids': [recipe.id for recipe in recipes]}, status=response_status)
+
+    @action(detail=False, methods=['get'], url_path='export')
+    def export(self, request):
+        """Stream every recipe as NDJSON or CSV (?output=ndjson|csv)."""
+        output = request.query_params.get('output', 'ndjson')
+        if output not in export.FORMATS:
+            raise ValidationError(
+                {'output': [f'Choose one of: {", ".join(export.FORMATS)}.']})
+        lines, alines, content_type = export.FORMATS[output]
+        if isinstance(request._request, ASGIRequest):
+            content = alines(export.aiter_recipes(request.user))
+        else:
+            content = lines(export.iter_recipes(request.user))
+        response = StreamingHttpResponse(content, content_type=content_type)
+        response['Content-Disposition'] = (
+            f'attachment; filename="recipes.{output}"')
+        return response
+
+
+class TagViewSet(ReplicaReadMixin, ConditionalListMixin, FastReadMixin, mixins.ListModelMixin, viewsets.GenericViewSet, mixins.UpdateModelMixin, mixins.DestroyModelMixin):
     serializer_class = serializers.TagSerializer
+    reader_class = readers.TagReader
     queryset = Tag.objects.all()
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
+    pagination_class = NameKeysetPagination
 
     def get_queryset(self):
-        return self.queryset.filter(user=self.request.user).order_by('-name')
+        queryset = self.queryset.filter(
+            user=self.request.user).order_by('-name')
+        if self.action == 'list':
+            queryset = filters.filter_tags(queryset, self.request.query_params)
+        return queryset
+
+
+class RecipeStatsView(ReplicaReadMixin, generics.RetrieveAPIView):
+    """Recipe totals and tag usage from the per-user summary rows."""
+    serializer_class = serializers.RecipeStatsSerializer
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get_object(self):
+        try:
+            limit = min(int(self.request.query_params.get('tags', 10)), 100)
+        except ValueError:
+            raise ValidationError({'tags': ['Must be an integer.']})
+        summary = stats.get_stats(self.request.user)
+        summary.top_tags = stats.top_tags(self.request.user, max(limit, 0))
+        return summary
+
+
+class AsyncReadView(View):
+    """
+    Route a viewset's GETs to its async ``a<action>`` reads, everything
+    else (and every read when API_FAST_READS is off) to the sync viewset.
+    """
+    viewset = None
+    actions = None
+    basename = None
+    detail = None
+    sync_view = None
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        initkwargs['sync_view'] = sync_to_async(initkwargs['viewset'].as_view(
+            initkwargs['actions'], basename=initkwargs['basename'],
+            detail=initkwargs['detail']))
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def dispatch(self, request, *args, **kwargs):
+        if request.method == 'GET' and settings.API_FAST_READS:
+            return await self.get(request, *args, **kwargs)
+        return await self.sync_view(request, *args, **kwargs)
+
+    async def get(self, request, *args, **kwargs):
+        view = self.viewset(basename=self.basename, detail=self.detail)
+        view.action_map = self.actions
+        view.args, view.kwargs = args, kwargs
+        request = view.initialize_request(request, *args, **kwargs)
+        view.request = request
+        view.headers = view.default_response_headers
+        try:
+            # Authentication, permissions and throttles are sync in DRF.
+            await sync_to_async(view.initial)(request, *args, **kwargs)
+            handler = getattr(view, f'a{view.action}')
+            response = await handler(request, *args, **kwargs)
+        except Exception as exc:
+            response = view.handle_exception(exc)
+        return view.finalize_response(request, response, *args, **kwargs)
@@ -1,3 +1,5 @@
+from unittest.mock import patch
+
 from django.test import TestCase
 from django.contrib.auth import get_user_model
 from django.urls import reverse
@@ -5,6 +7,8 @@ from django.urls import reverse
 from rest_framework.test import APIClient
 from rest_framework import status
 
+from core.throttling import local_store
+
 
 CREATE_USER_URL = reverse('user:create')
 
@@ -12,6 +16,8 @@ TOKEN_URL = reverse('user:token')
 
 ME_URL = reverse('user:me')
 
+LIST_USER_URL = reverse('user:list')
+
 
 def create_user(**params):
     return get_user_model().objects.create_user(**params)
@@ -19,6 +25,9 @@ def create_user(**params):
 
 class PublicUserAPITest(TestCase):
     def setUp(self):
+        # Sign-ups and logins all come from one address; start each test
+        # with fresh throttle buckets whatever rates are configured.
+        local_store.clear()
         self.client = APIClient()
 
     def test_create_user_success(self):
@@ -110,6 +119,10 @@ class PublicUserAPITest(TestCase):
         res = self.client.get(ME_URL)
         self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
 
+    def test_list_users_unauthorized(self):
+        res = self.client.get(LIST_USER_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
 
 class PrivateUserAPITest(TestCase):
     def setUp(self):
@@ -153,3 +166,55 @@ class PrivateUserAPITest(TestCase):
         self.assertTrue(self.user.check_password(payload['password']))
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_list_users_paginated(self):
+        for i in range(3):
+            create_user(email=f'user{i}@example.com', password='testpass123')
+
+        res = self.client.get(LIST_USER_URL, {'page_size': 2})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [user['email'] for user in res.data['results']],
+            ['user2@example.com', 'user1@example.com'])
+        self.assertEqual(res.data['count'], 4)
+        self.assertFalse(res.data['count_estimated'])
+        self.assertIsNotNone(res.data['next'])
+
+        res = self.client.get(res.data['next'])
+
+        self.assertEqual(
+            [user['email'] for user in res.data['results']],
+            ['user0@example.com', 'test@example.com'])
+        self.assertIsNone(res.data['next'])
+
+    def test_list_users_search_prefix(self):
+        create_user(email='alice@example.com', password='testpass123',
+                    name='Zed')
+        create_user(email='bob@example.com', password='testpass123',
+                    name='Alfred')
+        create_user(email='carol@example.com', password='testpass123',
+                    name='Malia')
+
+        res = self.client.get(LIST_USER_URL, {'search': 'AL'})
+
+        self.assertEqual(
+            [user['email'] for user in res.data['results']],
+            ['bob@example.com', 'alice@example.com'])
+        self.assertEqual(res.data['count'], 2)
+
+    def test_list_users_only_serialized_columns(self):
+        with self.assertNumQueries(2) as queries:
+            self.client.get(LIST_USER_URL)
+
+        select = queries.captured_queries[-1]['sql']
+        self.assertIn('"core_user"."email"', select)
+        self.assertNotIn('"core_user"."password"', select)
+
+    def test_list_users_estimated_count(self):
+        with patch('core.pagination.planner_estimate', return_value=50000):
+            res = self.client.get(LIST_USER_URL)
+
+        self.assertEqual(res.data['count'], 50000)
+        self.assertTrue(res.data['count_estimated'])
+        self.assertEqual(len(res.data['results']), 1)
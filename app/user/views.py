@@ -1,4 +1,4 @@
-from rest_framework import generics, authentication, permissions
+from rest_framework import generics, permissions
 from user.serializers import (
     UserSerializer, AuthTokenSerializer)
 from rest_framework.authtoken.views import ObtainAuthToken
@@ -6,26 +6,48 @@ from rest_framework.settings import api_settings
 # from core.models import User
 # from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from django.db.models import Q
+
+from core.authentication import CachedTokenAuthentication
+from core.mixins import ReplicaReadMixin
+from core.pagination import CountedKeysetPagination
+from core.throttling import (
+    CreateUserIPThrottle, LoginEmailThrottle, LoginIPThrottle)
 
 
 class CreateUserView(generics.CreateAPIView):
     serializer_class = UserSerializer
+    throttle_classes = [CreateUserIPThrottle]
 
 
 class CreateTokenView(ObtainAuthToken):
     serializer_class = AuthTokenSerializer
     renderer_classes = api_settings.DEFAULT_RENDERER_CLASSES
+    throttle_classes = [LoginIPThrottle, LoginEmailThrottle]
 
 
-class ManageUserView(generics.RetrieveUpdateAPIView):
+class ManageUserView(ReplicaReadMixin, generics.RetrieveUpdateAPIView):
     serializer_class = UserSerializer
-    authentication_classes = [authentication.TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [permissions.IsAuthenticated]
 
     def get_object(self):
         return self.request.user
 
 
-class ListUserView(generics.ListAPIView):
+class ListUserView(ReplicaReadMixin, generics.ListAPIView):
     serializer_class = UserSerializer
     queryset = get_user_model().objects.all()
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = CountedKeysetPagination
+
+    def get_queryset(self):
+        queryset = self.queryset.only('id', 'email', 'name').order_by('-id')
+        search = self.request.query_params.get('search', '').strip()
+        if search:
+            # Served by the UPPER(...) text_pattern_ops indexes from
+            # core/migrations/0007_user_prefix_search_indexes.py.
+            queryset = queryset.filter(
+                Q(email__istartswith=search) | Q(name__istartswith=search))
+        return queryset